@@ -1,36 +1,30 @@
+import sys
 from trace_generator import TraceGenerator, ServiceConfig
-from datetime import datetime
-import json
+
+# Output templates for a single trace, bound once so main() calls .format directly
+_FORMAT_TRACE = (
+    "\nTrace ID: {0}\n"
+    "Service: {1} ({2})\n"
+    "Duration: {3:.3f}s\n"
+    "Status: {4}\n"
+    "Parent Trace: {5}\n"
+    "Metadata:\n"
+    "{6}"
+).format
+_FORMAT_METADATA = "  {0[0]}: {0[1]}\n".format
+
+# Service architecture as (name, service_type, connections) tuples
+SERVICE_SPECS = (
+    ("frontend-proxy", "proxy", ("auth-service", "user-service")),
+    ("auth-service", "web", ("auth-db",)),
+    ("user-service", "web", ("user-db",)),
+    ("auth-db", "database", ()),
+    ("user-db", "database", ()),
+)
 
 def main():
     # Define the service architecture
-    services = [
-        ServiceConfig(
-            name="frontend-proxy",
-            service_type="proxy",
-            connections=["auth-service", "user-service"]
-        ),
-        ServiceConfig(
-            name="auth-service",
-            service_type="web",
-            connections=["auth-db"]
-        ),
-        ServiceConfig(
-            name="user-service",
-            service_type="web",
-            connections=["user-db"]
-        ),
-        ServiceConfig(
-            name="auth-db",
-            service_type="database",
-            connections=[]
-        ),
-        ServiceConfig(
-            name="user-db",
-            service_type="database",
-            connections=[]
-        )
-    ]
+    services = ServiceConfig.from_spec_batch(SERVICE_SPECS)
 
     # Create the trace generator
     generator = TraceGenerator(
@@ -42,16 +36,21 @@ def main():
     # Generate traces
     traces = generator.generate_traces(num_traces=10)
 
-    # Print traces in a readable format
+    # Build the readable output in memory and write it in a single call
+    lines = []
+    format_trace = _FORMAT_TRACE
     for trace in traces:
-        print(f"\nTrace ID: {trace.trace_id}")
-        print(f"Service: {trace.service_name} ({trace.service_type})")
-        print(f"Duration: {(trace.end_time - trace.start_time).total_seconds():.3f}s")
-        print(f"Status: {trace.status}")
-        print(f"Parent Trace: {trace.parent_trace_id or 'None'}")
-        print("Metadata:")
-        for key, value in trace.metadata.items():
-            print(f"  {key}: {value}")
+        metadata = "".join(map(_FORMAT_METADATA, trace.metadata.items()))
+        lines.append(format_trace(
+            trace.trace_id,
+            trace.service_name,
+            trace.service_type,
+            trace.duration_seconds,
+            trace.status,
+            trace.parent_trace_id,  # str.format renders a missing parent as 'None'
+            metadata,
+        ))
+    sys.stdout.write("".join(lines))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,25 +4,90 @@ Examples demonstrating how to use the TraceGenerator and pretty_print_traces.
 
 This script provides several examples of different service topologies and how to 
 generate and visualize traces using the pretty_print_traces method.
+
+Each example captures what it prints and returns it as a string, so the examples
+can be run in parallel and their output written out in one go.
 """
 
+import functools
+import io
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
 from trace_generator import ServiceConfig, TraceGenerator
 
+# Example topologies, built once at import time and shared by every call
+_SIMPLE_SERVICES = tuple(ServiceConfig.from_spec_batch((
+    ("gateway", "proxy", ("backend",)),
+    ("backend", "web", ("database",)),
+    ("database", "database", ()),
+)))
+
+_MICROSERVICES_SERVICES = tuple(ServiceConfig.from_spec_batch((
+    ("api-gateway", "proxy", ("auth-service", "user-service", "order-service")),
+    ("auth-service", "web", ("user-service", "auth-db")),
+    ("user-service", "web", ("user-db",)),
+    ("order-service", "web", ("inventory-service", "payment-service", "order-db")),
+    ("inventory-service", "web", ("inventory-db",)),
+    ("payment-service", "web", ("payment-db",)),
+    ("auth-db", "database", ()),
+    ("user-db", "database", ()),
+    ("order-db", "database", ()),
+    ("inventory-db", "database", ()),
+    ("payment-db", "database", ()),
+)))
+
+_HIGH_FAILURE_SERVICES = tuple(ServiceConfig.from_spec_batch((
+    ("edge-router", "proxy", ("api-service", "static-service")),
+    ("api-service", "web", ("auth-db", "content-db")),
+    ("static-service", "web", ()),
+    ("auth-db", "database", ()),
+    ("content-db", "database", ()),
+)))
+
+_ADVANCED_SERVICES = tuple(ServiceConfig.from_spec_batch((
+    ("mobile-api", "proxy", ("user-profile", "feed-service")),
+    ("user-profile", "web", ("user-db",)),
+    ("feed-service", "web", ("feed-db", "cache-service")),
+    ("cache-service", "web", ()),
+    ("user-db", "database", ()),
+    ("feed-db", "database", ()),
+)))
+
+_TOPOLOGIES = {
+    "simple": _SIMPLE_SERVICES,
+    "microservices": _MICROSERVICES_SERVICES,
+    "high_failure": _HIGH_FAILURE_SERVICES,
+    "advanced": _ADVANCED_SERVICES,
+}
+
+
+def _make_generator(topology_key: str, randomization_level: float = 0.3, num_groups: int = 3) -> TraceGenerator:
+    """Return a TraceGenerator for a named example topology."""
+    return TraceGenerator(_TOPOLOGIES[topology_key], randomization_level=randomization_level, num_groups=num_groups)
+
+
+def _captures_output(example):
+    """Decorator: run an example with stdout redirected and return the captured text."""
+    @functools.wraps(example)
+    def wrapper(*args, **kwargs) -> str:
+        with io.StringIO() as buffer, redirect_stdout(buffer):
+            example(*args, **kwargs)
+            return buffer.getvalue()
+    return wrapper
+
+
+@_captures_output
 def simple_topology_example():
     """
     A simple topology with a gateway connected to a single backend service and database.
     """
     print("\n\n=========== SIMPLE TOPOLOGY EXAMPLE ===========")
     
-    # Define services
-    services = [
-        ServiceConfig(name="gateway", service_type="proxy", connections=["backend"]),
-        ServiceConfig(name="backend", service_type="web", connections=["database"]),
-        ServiceConfig(name="database", service_type="database")
-    ]
-    
     # Create generator
-    generator = TraceGenerator(services, randomization_level=0.2)
+    generator = _make_generator("simple", randomization_level=0.2)
     
     # Generate a small number of traces
     traces = generator.generate_traces(num_traces=3)
@@ -31,29 +96,15 @@ def simple_topology_example():
     generator.pretty_print_traces(traces)
 
 
+@_captures_output
 def microservices_topology_example():
     """
     A microservices topology with multiple services and databases.
     """
     print("\n\n=========== MICROSERVICES TOPOLOGY EXAMPLE ===========")
     
-    # Define services
-    services = [
-        ServiceConfig(name="api-gateway", service_type="proxy", connections=["auth-service", "user-service", "order-service"]),
-        ServiceConfig(name="auth-service", service_type="web", connections=["user-service", "auth-db"]),
-        ServiceConfig(name="user-service", service_type="web", connections=["user-db"]),
-        ServiceConfig(name="order-service", service_type="web", connections=["inventory-service", "payment-service", "order-db"]),
-        ServiceConfig(name="inventory-service", service_type="web", connections=["inventory-db"]),
-        ServiceConfig(name="payment-service", service_type="web", connections=["payment-db"]),
-        ServiceConfig(name="auth-db", service_type="database"),
-        ServiceConfig(name="user-db", service_type="database"),
-        ServiceConfig(name="order-db", service_type="database"),
-        ServiceConfig(name="inventory-db", service_type="database"),
-        ServiceConfig(name="payment-db", service_type="database"),
-    ]
-    
     # Create generator
-    generator = TraceGenerator(services, randomization_level=0.4, num_groups=5)
+    generator = _make_generator("microservices", randomization_level=0.4, num_groups=5)
     
     # Generate traces
     traces = generator.generate_traces(num_traces=10)
@@ -62,23 +113,15 @@ def microservices_topology_example():
     generator.pretty_print_traces(traces, max_traces=3)
 
 
+@_captures_output
 def high_failure_rate_example():
     """
     An example with a higher randomization level to demonstrate error visualization.
     """
     print("\n\n=========== HIGH FAILURE RATE EXAMPLE ===========")
     
-    # Define services
-    services = [
-        ServiceConfig(name="edge-router", service_type="proxy", connections=["api-service", "static-service"]),
-        ServiceConfig(name="api-service", service_type="web", connections=["auth-db", "content-db"]),
-        ServiceConfig(name="static-service", service_type="web"),
-        ServiceConfig(name="auth-db", service_type="database"),
-        ServiceConfig(name="content-db", service_type="database"),
-    ]
-    
     # Create generator with high randomization (more errors)
-    generator = TraceGenerator(services, randomization_level=0.8, num_groups=2)
+    generator = _make_generator("high_failure", randomization_level=0.8, num_groups=2)
     
     # Generate traces
     traces = generator.generate_traces(num_traces=5)
@@ -87,48 +130,57 @@ def high_failure_rate_example():
     generator.pretty_print_traces(traces)
 
 
+@_captures_output
 def advanced_options_example():
     """
     Examples of using different options with the pretty_print_traces method.
     """
     print("\n\n=========== ADVANCED OPTIONS EXAMPLE ===========")
     
-    # Define services
-    services = [
-        ServiceConfig(name="mobile-api", service_type="proxy", connections=["user-profile", "feed-service"]),
-        ServiceConfig(name="user-profile", service_type="web", connections=["user-db"]),
-        ServiceConfig(name="feed-service", service_type="web", connections=["feed-db", "cache-service"]),
-        ServiceConfig(name="cache-service", service_type="web"),
-        ServiceConfig(name="user-db", service_type="database"),
-        ServiceConfig(name="feed-db", service_type="database"),
-    ]
-    
     # Create generator
-    generator = TraceGenerator(services)
+    generator = _make_generator("advanced")
     
     # Generate a larger number of traces
     traces = generator.generate_traces(num_traces=15)
     
+    # Group the traces once and reuse the view for every display below
+    view = generator.prepare_for_display(traces)
+    
     # Example 1: Show just 1 trace
     print("\n=== Displaying a single trace ===")
-    generator.pretty_print_traces(traces, max_traces=1)
+    generator.pretty_print_traces(view, max_traces=1)
     
     # Example 2: Show 5 traces
     print("\n=== Displaying 5 traces ===")
-    generator.pretty_print_traces(traces, max_traces=5)
+    generator.pretty_print_traces(view, max_traces=5)
     
     # Example 3: Show all traces
     print("\n=== Displaying all traces ===")
-    generator.pretty_print_traces(traces, max_traces=len(traces))
+    generator.pretty_print_traces(view, max_traces=len(traces))
+
+
+def _run_example(name: str, seed: int) -> str:
+    """Run one example by name with the random module seeded, and return its captured output."""
+    random.seed(seed)
+    return _EXAMPLES[name]()
+
+
+_EXAMPLES = {
+    "simple": simple_topology_example,
+    "microservices": microservices_topology_example,
+    "high_failure": high_failure_rate_example,
+    "advanced": advanced_options_example,
+}
 
 
 if __name__ == "__main__":
     print("Running TraceGenerator Examples")
     
-    # Run examples
-    simple_topology_example()
-    microservices_topology_example()
-    high_failure_rate_example()
-    advanced_options_example()
+    # Run the independent examples in parallel and print their output in order. Forked
+    # workers inherit this process's random state, so each example gets its own seed
+    seeds = [random.getrandbits(64) for _ in _EXAMPLES]
+    with ProcessPoolExecutor(max_workers=len(_EXAMPLES)) as executor:
+        outputs = list(executor.map(_run_example, _EXAMPLES, seeds))
+    sys.stdout.write("".join(outputs))
     
-    print("\nAll examples completed.") 
\ No newline at end of file
+    print("\nAll examples completed.")
\ No newline at end of file
@@ -6,14 +6,69 @@ This script demonstrates how to use the trace_utils.py module to generate
 different types of trace datasets and save them to files.
 """
 
-from trace_generator import ServiceConfig, TraceGenerator
+from trace_generator import ServiceConfig, TraceGenerator, pretty_print_traces
 import trace_utils
+import io
+import logging
 import os
-import json
+import sys
+from collections import Counter
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import numpy as np
 
 # Create a dataset directory if it doesn't exist
 os.makedirs("datasets", exist_ok=True)
 
+# Web checkout flow: api-gateway → web-bff → [auth, cart, order, notification] → many sub-services.
+# Each row is (trace ID suffix, parent trace ID suffix, service name, service type), with suffixes
+# appended to a per-checkout root trace ID; this yields 10-20 nodes per hierarchy.
+CHECKOUT_TEMPLATE = (
+    # Level 1: API Gateway
+    ("", None, "api-gateway", "proxy"),
+    # Level 2: Web BFF
+    ("_bff", "", "web-bff", "proxy"),
+    # Level 3: Auth service (authentication check)
+    ("_bff_auth", "_bff", "auth-service", "web"),
+    # Level 4: Token service (called by auth), Level 5: Token DB
+    ("_bff_auth_token", "_bff_auth", "token-service", "web"),
+    ("_bff_auth_token_db", "_bff_auth_token", "token-db", "database"),
+    # Level 3: Cart service (get cart), Level 4: Cart DB
+    ("_bff_cart", "_bff", "cart-service", "web"),
+    ("_bff_cart_db", "_bff_cart", "cart-db", "database"),
+    # Level 4: Product service (called by cart to get product details), Level 5: Product DB
+    ("_bff_cart_product", "_bff_cart", "product-service", "web"),
+    ("_bff_cart_product_db", "_bff_cart_product", "product-db", "database"),
+    # Level 4: Pricing service (called by cart), Level 5: Tax service, Level 6: Tax DB
+    ("_bff_cart_pricing", "_bff_cart", "pricing-service", "web"),
+    ("_bff_cart_pricing_tax", "_bff_cart_pricing", "tax-service", "web"),
+    ("_bff_cart_pricing_tax_db", "_bff_cart_pricing_tax", "tax-db", "database"),
+    # Level 3: Order service (create order), Level 4: Order DB
+    ("_bff_order", "_bff", "order-service", "web"),
+    ("_bff_order_db", "_bff_order", "order-db", "database"),
+    # Level 4: Payment service, Level 5: Payment gateway and fraud detection, Level 6: Fraud DB
+    ("_bff_order_payment", "_bff_order", "payment-service", "web"),
+    ("_bff_order_payment_gateway", "_bff_order_payment", "payment-gateway-service", "web"),
+    ("_bff_order_payment_fraud", "_bff_order_payment", "fraud-detection-service", "web"),
+    ("_bff_order_payment_fraud_db", "_bff_order_payment_fraud", "fraud-db", "database"),
+    # Level 4: Inventory service (check and update inventory), Level 5: Inventory DB
+    ("_bff_order_inventory", "_bff_order", "inventory-service", "web"),
+    ("_bff_order_inventory_db", "_bff_order_inventory", "inventory-db", "database"),
+    # Level 5: Warehouse service, Level 6: Warehouse DB
+    ("_bff_order_inventory_warehouse", "_bff_order_inventory", "warehouse-service", "web"),
+    ("_bff_order_inventory_warehouse_db", "_bff_order_inventory_warehouse", "warehouse-db", "database"),
+    # Level 4: Shipping service, Level 5: Shipping DB
+    ("_bff_order_shipping", "_bff_order", "shipping-service", "web"),
+    ("_bff_order_shipping_db", "_bff_order_shipping", "shipping-db", "database"),
+    # Level 5: Logistics service, Level 6: Logistics DB
+    ("_bff_order_shipping_logistics", "_bff_order_shipping", "logistics-service", "web"),
+    ("_bff_order_shipping_logistics_db", "_bff_order_shipping_logistics", "logistics-db", "database"),
+    # Level 3: User notification (order confirmation), Level 4: Email service
+    ("_bff_notification", "_bff", "notification-service", "web"),
+    ("_bff_notification_email", "_bff_notification", "email-service", "web"),
+)
+
 def generate_simple_dataset():
     """Generate a small dataset with the simple topology."""
     print("\n=== Generating Simple Topology Dataset ===")
@@ -30,13 +85,11 @@ def generate_simple_dataset():
     )
     
     # Save to both JSON and CSV
-    trace_utils.save_to_json(traces, "datasets/simple_topology_100.json")
-    trace_utils.save_to_csv(traces, "datasets/simple_topology_100.csv")
+    trace_utils.save_dataset(traces, "datasets/simple_topology_100.json", "datasets/simple_topology_100.csv", pretty=False)
     
     # Preview a few traces
-    generator = TraceGenerator(services)
     print("\nPreview of the generated traces:")
-    generator.pretty_print_traces(traces, max_traces=2)
+    pretty_print_traces(traces, max_traces=2)
 
 
 def generate_microservices_dataset():
@@ -55,14 +108,12 @@ def generate_microservices_dataset():
         seed=43
     )
     
-    # Save to both JSON and CSV
-    trace_utils.save_to_json(traces, "datasets/microservices_topology_500.json")
-    trace_utils.save_to_csv(traces, "datasets/microservices_topology_500.csv")
+    # Save to both NDJSON and CSV
+    trace_utils.save_dataset(traces, "datasets/microservices_topology_500.ndjson", "datasets/microservices_topology_500.csv")
     
     # Preview a few traces
-    generator = TraceGenerator(services)
     print("\nPreview of the generated traces:")
-    generator.pretty_print_traces(traces, max_traces=2)
+    pretty_print_traces(traces, max_traces=2)
 
 
 def generate_complex_dataset():
@@ -72,8 +123,8 @@ def generate_complex_dataset():
     # Use the predefined complex topology
     services = trace_utils.generate_example_services("complex")
     
-    # Generate 1000 traces with high randomization
-    traces = trace_utils.generate_dataset(
+    # Generate 1000 traces with high randomization, sharded across processes
+    traces = trace_utils.generate_dataset_parallel(
         services=services,
         num_traces=1000,
         randomization_level=0.5,
@@ -81,14 +132,12 @@ def generate_complex_dataset():
         seed=44
     )
     
-    # Save to both JSON and CSV
-    trace_utils.save_to_json(traces, "datasets/complex_topology_1000.json")
-    trace_utils.save_to_csv(traces, "datasets/complex_topology_1000.csv")
+    # Save to both NDJSON and CSV
+    trace_utils.save_dataset(traces, "datasets/complex_topology_1000.ndjson", "datasets/complex_topology_1000.csv")
     
     # Preview a few traces
-    generator = TraceGenerator(services)
     print("\nPreview of the generated traces:")
-    generator.pretty_print_traces(traces, max_traces=2)
+    pretty_print_traces(traces, max_traces=2)
 
 
 def generate_custom_dataset():
@@ -119,39 +168,37 @@ def generate_custom_dataset():
     )
     
     # Save to both JSON and CSV
-    trace_utils.save_to_json(traces, "datasets/custom_topology_300.json")
-    trace_utils.save_to_csv(traces, "datasets/custom_topology_300.csv")
+    trace_utils.save_dataset(traces, "datasets/custom_topology_300.json", "datasets/custom_topology_300.csv", pretty=False)
     
     # Preview a few traces
-    generator = TraceGenerator(services)
     print("\nPreview of the generated traces:")
-    generator.pretty_print_traces(traces, max_traces=2)
+    pretty_print_traces(traces, max_traces=2)
 
 
 def load_and_analyze_dataset():
     """Demonstrate loading a dataset from a file and doing basic analysis."""
     print("\n=== Loading and Analyzing Dataset ===")
     
-    # Load traces from the JSON file
-    traces = trace_utils.load_from_json("datasets/microservices_topology_500.json")
-    
-    # Basic analysis: count traces by service type
-    service_type_counts = {}
-    for trace in traces:
-        if trace.service_type not in service_type_counts:
-            service_type_counts[trace.service_type] = 0
+    # Stream traces from the NDJSON file, counting by service type and status in one pass
+    input_file = "datasets/microservices_topology_500.ndjson"
+    service_type_counts = Counter()
+    status_counts = Counter()
+    for trace in trace_utils.iter_from_ndjson(input_file):
         service_type_counts[trace.service_type] += 1
+        status_counts[trace.status] += 1
+    total_count = sum(status_counts.values())
+    print(f"Loaded {total_count} traces from {input_file}")
     
     print("\nCounts by service type:")
     for service_type, count in service_type_counts.items():
         print(f"  {service_type}: {count} traces")
     
     # Count success vs error
-    success_count = sum(1 for trace in traces if trace.status == "success")
-    error_count = len(traces) - success_count
+    success_count = status_counts["success"]
+    error_count = total_count - success_count
     
-    print(f"\nSuccess rate: {success_count/len(traces)*100:.1f}% ({success_count}/{len(traces)})")
-    print(f"Error rate: {error_count/len(traces)*100:.1f}% ({error_count}/{len(traces)})")
+    print(f"\nSuccess rate: {success_count/total_count*100:.1f}% ({success_count}/{total_count})")
+    print(f"Error rate: {error_count/total_count*100:.1f}% ({error_count}/{total_count})")
 
 
 def analyze_trace_hierarchies():
@@ -163,57 +210,66 @@ def analyze_trace_hierarchies():
     print(f"Loading traces from {file_path}...")
     traces = trace_utils.load_from_json(file_path)
     
+    # Index children once; the summaries below and the hierarchy walk all reuse it
+    child_map = trace_utils.build_child_map(traces)
+    
     # Get an overall summary of the dataset
-    trace_utils.print_trace_summary(traces, max_traces=3)
+    trace_utils.print_trace_summary(traces, max_traces=3, child_map=child_map)
+    
+    # Index traces by ID and collect root traces and errors in a single pass
+    by_id = {}
+    root_traces = []
+    error_root_ids = set()
+    error_parent_ids = set()
+    for t in traces:
+        by_id[t.trace_id] = t
+        if t.parent_trace_id is None:
+            root_traces.append(t)
+            if t.status == "error":
+                error_root_ids.add(t.trace_id)
+        elif t.status == "error":
+            error_parent_ids.add(t.parent_trace_id)
     
     # Find the first root trace with an error somewhere in its hierarchy
-    root_traces = [t for t in traces if t.parent_trace_id is None]
-    error_trace_ids = set(t.trace_id for t in traces if t.status == "error")
-    error_parent_ids = set(t.parent_trace_id for t in traces if t.parent_trace_id and t.status == "error")
-    error_root_ids = error_trace_ids.intersection(set(t.trace_id for t in root_traces))
-    
     if error_root_ids:
         # Found a root trace with an error
         sample_error_root_id = list(error_root_ids)[0]
         print(f"\n=== Examining a trace hierarchy with errors (Root ID: {sample_error_root_id}) ===")
-        trace_utils.print_trace_summary(traces, trace_id=sample_error_root_id)
+        trace_utils.print_trace_summary(traces, trace_id=sample_error_root_id, child_map=child_map)
     elif error_parent_ids:
         # Find a root trace that has a child with an error
         for parent_id in error_parent_ids:
-            parent_trace = next((t for t in traces if t.trace_id == parent_id), None)
+            parent_trace = by_id.get(parent_id)
             if parent_trace:
                 root_trace = parent_trace
                 while root_trace.parent_trace_id:
-                    root_trace = next((t for t in traces if t.trace_id == root_trace.parent_trace_id), None)
+                    root_trace = by_id.get(root_trace.parent_trace_id)
                     if not root_trace:
                         break
                 
                 if root_trace:
                     print(f"\n=== Examining a trace hierarchy with errors (Root ID: {root_trace.trace_id}) ===")
-                    trace_utils.print_trace_summary(traces, trace_id=root_trace.trace_id)
+                    trace_utils.print_trace_summary(traces, trace_id=root_trace.trace_id, child_map=child_map)
                     break
     
     # Extract all trace hierarchies and analyze them
     print("\n=== Analyzing All Trace Hierarchies ===")
     
-    # Group traces by root trace
-    hierarchies = {}
-    
-    # Find all root traces
-    for trace in traces:
-        if trace.parent_trace_id is None:
-            hierarchies[trace.trace_id] = trace_utils.extract_trace_hierarchy(traces, trace.trace_id)
-    
-    # Analyze each hierarchy
+    # Analyze each hierarchy, walking each root trace's own subtree
     hierarchy_stats = []
-    for root_id, hierarchy in hierarchies.items():
+    for root_trace in root_traces:
+        root_id = root_trace.trace_id
+        hierarchy = []
+        depth = 0
+        for t, level in trace_utils.iter_hierarchy(root_trace, child_map):
+            hierarchy.append(t)
+            depth = max(depth, level + 1)
         success_rate = sum(1 for t in hierarchy if t.status == "success") / len(hierarchy)
-        depth = max((hierarchy.index(t) for t in hierarchy), default=0) + 1
         services_used = len(set(t.service_name for t in hierarchy))
         
         hierarchy_stats.append({
             "root_id": root_id,
-            "root_service": next(t for t in hierarchy if t.trace_id == root_id).service_name,
+            "root_service": by_id[root_id].service_name,
             "trace_count": len(hierarchy),
             "success_rate": success_rate,
             "depth": depth,
@@ -233,7 +289,7 @@ def analyze_trace_hierarchies():
     # Save a reorganized version of the dataset
     reorganized_file = "datasets/random_medium_topology_200_reorganized.json"
     print(f"\nSaving reorganized traces to {reorganized_file}...")
-    trace_utils.save_to_json(traces, reorganized_file)
+    trace_utils.save_to_json(traces, reorganized_file, pretty=False)
 
 
 def generate_random_topology_dataset():
@@ -266,12 +322,11 @@ def generate_random_topology_dataset():
     )
     
     # Save to file
-    trace_utils.save_to_json(traces_small, "datasets/random_small_topology_50.json")
+    trace_utils.save_to_json(traces_small, "datasets/random_small_topology_50.json", pretty=False)
     
     # Preview traces
-    generator = TraceGenerator(services_small)
     print("\nPreview of the generated traces:")
-    generator.pretty_print_traces(traces_small, max_traces=2)
+    pretty_print_traces(traces_small, max_traces=2)
     
     # Example 2: Medium random topology with more variability
     print("\n--- Medium Random Topology (15 services) ---")
@@ -294,12 +349,11 @@ def generate_random_topology_dataset():
     )
     
     # Save to file
-    trace_utils.save_to_json(traces_medium, "datasets/random_medium_topology_200.json")
+    trace_utils.save_to_json(traces_medium, "datasets/random_medium_topology_200.json", pretty=False)
     
     # Preview traces
-    generator = TraceGenerator(services_medium)
     print("\nPreview of the generated traces:")
-    generator.pretty_print_traces(traces_medium, max_traces=2)
+    pretty_print_traces(traces_medium, max_traces=2)
     
     # Example 3: Large random topology with high complexity
     print("\n--- Large Random Topology (30 services) ---")
@@ -312,8 +366,8 @@ def generate_random_topology_dataset():
         seed=54
     )
     
-    # Generate traces
-    traces_large = trace_utils.generate_dataset(
+    # Generate traces, sharded across processes
+    traces_large = trace_utils.generate_dataset_parallel(
         services=services_large,
         num_traces=400,
         randomization_level=0.4,
@@ -322,18 +376,14 @@ def generate_random_topology_dataset():
     )
     
     # Save to both JSON and CSV
-    trace_utils.save_to_json(traces_large, "datasets/random_large_topology_400.json")
-    trace_utils.save_to_csv(traces_large, "datasets/random_large_topology_400.csv")
+    trace_utils.save_dataset(traces_large, "datasets/random_large_topology_400.json", "datasets/random_large_topology_400.csv", pretty=False)
     
     # Save topology for future reference
-    topology_json = [s.model_dump() for s in services_large]
-    with open("datasets/random_large_topology.json", 'w') as f:
-        json.dump(topology_json, f, indent=2)
+    trace_utils.save_topology(services_large, "datasets/random_large_topology.json")
     
     # Preview traces
-    generator = TraceGenerator(services_large)
     print("\nPreview of the generated traces:")
-    generator.pretty_print_traces(traces_large, max_traces=2)
+    pretty_print_traces(traces_large, max_traces=2)
 
 
 def generate_realistic_microservices_topology():
@@ -435,255 +485,18 @@ def generate_realistic_microservices_topology():
     
     # Checkout flow traces - these will have deeper hierarchies
     print("\nGenerating 50 checkout flow traces (deeper hierarchies)...")
-    checkout_traces = []
-    
-    for _ in range(50):
-        # Start a trace from the API gateway
-        root_trace_id = f"checkout_trace_{_}"
-        
-        # Create the trace hierarchy manually to ensure we get realistic patterns
-        # Web checkout flow: api-gateway → web-bff → [auth, product, cart, order] → many sub-services
-        # This will ensure we get 10-20 nodes per trace
-        
-        # Level 1: API Gateway
-        checkout_traces.append(generator._create_trace(
-            trace_id=root_trace_id,
-            service_name="api-gateway",
-            service_type="proxy",
-            parent_trace_id=None
-        ))
-        
-        # Level 2: Web BFF
-        bff_trace_id = f"{root_trace_id}_bff"
-        checkout_traces.append(generator._create_trace(
-            trace_id=bff_trace_id,
-            service_name="web-bff",
-            service_type="proxy",
-            parent_trace_id=root_trace_id
-        ))
-        
-        # Level 3: Auth service (authentication check)
-        auth_trace_id = f"{bff_trace_id}_auth"
-        checkout_traces.append(generator._create_trace(
-            trace_id=auth_trace_id,
-            service_name="auth-service",
-            service_type="web",
-            parent_trace_id=bff_trace_id
-        ))
-        
-        # Level 4: Token and user services (called by auth)
-        token_trace_id = f"{auth_trace_id}_token"
-        checkout_traces.append(generator._create_trace(
-            trace_id=token_trace_id,
-            service_name="token-service",
-            service_type="web",
-            parent_trace_id=auth_trace_id
-        ))
-        
-        # Level 5: Token DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{token_trace_id}_db",
-            service_name="token-db",
-            service_type="database",
-            parent_trace_id=token_trace_id
-        ))
-        
-        # Level 3: Cart service (get cart)
-        cart_trace_id = f"{bff_trace_id}_cart"
-        checkout_traces.append(generator._create_trace(
-            trace_id=cart_trace_id,
-            service_name="cart-service",
-            service_type="web",
-            parent_trace_id=bff_trace_id
-        ))
-        
-        # Level 4: Cart DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{cart_trace_id}_db",
-            service_name="cart-db",
-            service_type="database",
-            parent_trace_id=cart_trace_id
-        ))
-        
-        # Level 4: Product service (called by cart to get product details)
-        product_trace_id = f"{cart_trace_id}_product"
-        checkout_traces.append(generator._create_trace(
-            trace_id=product_trace_id,
-            service_name="product-service",
-            service_type="web",
-            parent_trace_id=cart_trace_id
-        ))
-        
-        # Level 5: Product DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{product_trace_id}_db",
-            service_name="product-db",
-            service_type="database",
-            parent_trace_id=product_trace_id
-        ))
-        
-        # Level 4: Pricing service (called by cart)
-        pricing_trace_id = f"{cart_trace_id}_pricing"
-        checkout_traces.append(generator._create_trace(
-            trace_id=pricing_trace_id,
-            service_name="pricing-service",
-            service_type="web",
-            parent_trace_id=cart_trace_id
-        ))
-        
-        # Level 5: Tax service
-        tax_trace_id = f"{pricing_trace_id}_tax"
-        checkout_traces.append(generator._create_trace(
-            trace_id=tax_trace_id,
-            service_name="tax-service",
-            service_type="web",
-            parent_trace_id=pricing_trace_id
-        ))
-        
-        # Level 6: Tax DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{tax_trace_id}_db",
-            service_name="tax-db",
-            service_type="database",
-            parent_trace_id=tax_trace_id
-        ))
-        
-        # Level 3: Order service (create order)
-        order_trace_id = f"{bff_trace_id}_order"
-        checkout_traces.append(generator._create_trace(
-            trace_id=order_trace_id,
-            service_name="order-service",
-            service_type="web",
-            parent_trace_id=bff_trace_id
-        ))
-        
-        # Level 4: Order DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{order_trace_id}_db",
-            service_name="order-db",
-            service_type="database",
-            parent_trace_id=order_trace_id
-        ))
-        
-        # Level 4: Payment service
-        payment_trace_id = f"{order_trace_id}_payment"
-        checkout_traces.append(generator._create_trace(
-            trace_id=payment_trace_id,
-            service_name="payment-service",
-            service_type="web",
-            parent_trace_id=order_trace_id
-        ))
-        
-        # Level 5: Payment gateway
-        gateway_trace_id = f"{payment_trace_id}_gateway"
-        checkout_traces.append(generator._create_trace(
-            trace_id=gateway_trace_id,
-            service_name="payment-gateway-service",
-            service_type="web",
-            parent_trace_id=payment_trace_id
-        ))
-        
-        # Level 5: Fraud detection
-        fraud_trace_id = f"{payment_trace_id}_fraud"
-        checkout_traces.append(generator._create_trace(
-            trace_id=fraud_trace_id,
-            service_name="fraud-detection-service",
-            service_type="web",
-            parent_trace_id=payment_trace_id
-        ))
-        
-        # Level 6: Fraud DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{fraud_trace_id}_db",
-            service_name="fraud-db",
-            service_type="database",
-            parent_trace_id=fraud_trace_id
-        ))
-        
-        # Level 4: Inventory service (check and update inventory)
-        inventory_trace_id = f"{order_trace_id}_inventory"
-        checkout_traces.append(generator._create_trace(
-            trace_id=inventory_trace_id,
-            service_name="inventory-service",
-            service_type="web",
-            parent_trace_id=order_trace_id
-        ))
-        
-        # Level 5: Inventory DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{inventory_trace_id}_db",
-            service_name="inventory-db",
-            service_type="database",
-            parent_trace_id=inventory_trace_id
-        ))
-        
-        # Level 5: Warehouse service
-        warehouse_trace_id = f"{inventory_trace_id}_warehouse"
-        checkout_traces.append(generator._create_trace(
-            trace_id=warehouse_trace_id,
-            service_name="warehouse-service",
-            service_type="web",
-            parent_trace_id=inventory_trace_id
-        ))
-        
-        # Level 6: Warehouse DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{warehouse_trace_id}_db",
-            service_name="warehouse-db",
-            service_type="database",
-            parent_trace_id=warehouse_trace_id
-        ))
-        
-        # Level 4: Shipping service
-        shipping_trace_id = f"{order_trace_id}_shipping"
-        checkout_traces.append(generator._create_trace(
-            trace_id=shipping_trace_id,
-            service_name="shipping-service",
-            service_type="web",
-            parent_trace_id=order_trace_id
-        ))
-        
-        # Level 5: Shipping DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{shipping_trace_id}_db",
-            service_name="shipping-db",
-            service_type="database",
-            parent_trace_id=shipping_trace_id
-        ))
-        
-        # Level 5: Logistics service
-        logistics_trace_id = f"{shipping_trace_id}_logistics"
-        checkout_traces.append(generator._create_trace(
-            trace_id=logistics_trace_id,
-            service_name="logistics-service",
-            service_type="web",
-            parent_trace_id=shipping_trace_id
-        ))
-        
-        # Level 6: Logistics DB
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{logistics_trace_id}_db",
-            service_name="logistics-db",
-            service_type="database",
-            parent_trace_id=logistics_trace_id
-        ))
-        
-        # Level 3: User notification (order confirmation)
-        notification_trace_id = f"{bff_trace_id}_notification"
-        checkout_traces.append(generator._create_trace(
-            trace_id=notification_trace_id,
-            service_name="notification-service",
-            service_type="web",
-            parent_trace_id=bff_trace_id
-        ))
-        
-        # Level 4: Email service
-        checkout_traces.append(generator._create_trace(
-            trace_id=f"{notification_trace_id}_email",
-            service_name="email-service",
-            service_type="web", 
-            parent_trace_id=notification_trace_id
-        ))
+    base_time = datetime.now()
+    checkout_traces = [
+        generator._create_trace(
+            trace_id=root_trace_id + suffix,
+            service_name=service_name,
+            service_type=service_type,
+            parent_trace_id=None if parent_suffix is None else root_trace_id + parent_suffix,
+            base_time=base_time
+        )
+        for root_trace_id in (f"checkout_trace_{i}" for i in range(50))
+        for suffix, parent_suffix, service_name, service_type in CHECKOUT_TEMPLATE
+    ]
     
     # Generate additional random traces
     print("Generating 150 additional random traces...")
@@ -694,48 +507,30 @@ def generate_realistic_microservices_topology():
     print(f"Total traces generated: {len(all_traces)}")
     
     # Save the traces and topology
-    trace_utils.save_to_json(all_traces, "datasets/realistic_microservices_200.json")
-    trace_utils.save_to_csv(all_traces, "datasets/realistic_microservices_200.csv")
+    trace_utils.save_dataset(all_traces, "datasets/realistic_microservices_200.ndjson", "datasets/realistic_microservices_200.csv")
     
     # Save the topology
-    topology_json = [s.model_dump() for s in services]
-    with open("datasets/realistic_microservices_topology.json", 'w') as f:
-        json.dump(topology_json, f, indent=2)
+    trace_utils.save_topology(services, "datasets/realistic_microservices_topology.json")
     
     # Print statistics about the trace hierarchies
     root_traces = [t for t in all_traces if t.parent_trace_id is None]
     print(f"\nGenerated {len(root_traces)} root traces")
     
-    # Let's analyze the size of each hierarchy
+    # Let's analyze the size of each hierarchy: the number of traces in its subtree
+    child_map = trace_utils.build_child_map(all_traces)
     hierarchy_sizes = {}
-    for trace in root_traces:
-        hierarchy = trace_utils.extract_trace_hierarchy(all_traces, trace.trace_id)
-        hierarchy_sizes[trace.trace_id] = len(hierarchy)
+    for root_trace in root_traces:
+        hierarchy_sizes[root_trace.trace_id] = sum(1 for _ in trace_utils.iter_hierarchy(root_trace, child_map))
     
     # Group by size ranges
-    size_ranges = {
-        "1-5": 0,
-        "6-10": 0,
-        "11-15": 0,
-        "16-20": 0,
-        "21+": 0
-    }
-    
-    for size in hierarchy_sizes.values():
-        if size <= 5:
-            size_ranges["1-5"] += 1
-        elif size <= 10:
-            size_ranges["6-10"] += 1
-        elif size <= 15:
-            size_ranges["11-15"] += 1
-        elif size <= 20:
-            size_ranges["16-20"] += 1
-        else:
-            size_ranges["21+"] += 1
-    
-    print("\nTrace hierarchy size distribution:")
-    for size_range, count in size_ranges.items():
-        print(f"  {size_range} nodes: {count} traces ({count/len(root_traces)*100:.1f}%)")
+    range_labels = ["1-5", "6-10", "11-15", "16-20", "21+"]
+    range_counts, _ = np.histogram(list(hierarchy_sizes.values()), bins=[1, 6, 11, 16, 21, np.inf])
+    size_ranges = dict(zip(range_labels, range_counts.tolist()))
+    
+    print("\nTrace hierarchy size distribution:\n" + "\n".join(
+        f"  {size_range} nodes: {count} traces ({count/len(root_traces)*100:.1f}%)"
+        for size_range, count in size_ranges.items()
+    ))
     
     # Display a sample of the larger hierarchies
     large_hierarchies = [trace_id for trace_id, size in hierarchy_sizes.items() if size >= 10]
@@ -743,24 +538,53 @@ def generate_realistic_microservices_topology():
     if large_hierarchies:
         sample_trace_id = large_hierarchies[0]
         print(f"\nPreview of a large trace hierarchy (ID: {sample_trace_id}):")
-        trace_utils.print_trace_summary(all_traces, trace_id=sample_trace_id)
+        trace_utils.print_trace_summary(all_traces, trace_id=sample_trace_id, child_map=child_map)
     
     return all_traces, services
 
 
+def _capture_output(step) -> str:
+    """Run one step with stdout redirected to an in-memory buffer and return the text."""
+    with io.StringIO() as buffer, redirect_stdout(buffer):
+        # Include trace_utils' progress messages (files saved and loaded) in the report
+        handler = logging.StreamHandler(buffer)
+        trace_utils.logger.addHandler(handler)
+        trace_utils.logger.setLevel(logging.INFO)
+        try:
+            step()
+        finally:
+            trace_utils.logger.removeHandler(handler)
+        return buffer.getvalue()
+
+
+# Independent dataset generators, each writing its own files
+_DATASET_GENERATORS = (
+    generate_simple_dataset,
+    generate_microservices_dataset,
+    generate_complex_dataset,
+    generate_custom_dataset,
+    generate_random_topology_dataset,
+    generate_realistic_microservices_topology,
+)
+
+# Analysis steps, which read files written by the generators
+_ANALYSIS_STEPS = (
+    load_and_analyze_dataset,
+    analyze_trace_hierarchies,
+)
+
+
 if __name__ == "__main__":
     print("=== Trace Generator Dataset Examples ===")
     
-    # Generate different datasets
-    generate_simple_dataset()
-    generate_microservices_dataset()
-    generate_complex_dataset()
-    generate_custom_dataset()
-    generate_random_topology_dataset()
-    generate_realistic_microservices_topology()
+    # Generate the independent datasets in parallel, keeping their output in order
+    with ProcessPoolExecutor(max_workers=min(len(_DATASET_GENERATORS), os.cpu_count() or 1)) as executor:
+        outputs = list(executor.map(_capture_output, _DATASET_GENERATORS))
     
     # Load and analyze datasets
-    load_and_analyze_dataset()
-    analyze_trace_hierarchies()
+    outputs.extend(_capture_output(step) for step in _ANALYSIS_STEPS)
+    
+    # Write the whole report in one go
+    sys.stdout.write("".join(outputs))
     
-    print("\nAll examples completed!") 
\ No newline at end of file
+    print("\nAll examples completed!")
@@ -0,0 +1,101 @@
+"""Tests for the trace_generator package."""
+
+import io
+import pickle
+import unittest
+from datetime import datetime, timedelta
+
+from trace_generator import Trace, _construct_trace, prepare_for_display, pretty_print_traces
+
+
+def _trace_fields(**overrides) -> dict:
+    """Return a full set of valid Trace fields."""
+    start_time = datetime(2024, 1, 1, 12, 0, 0, 250000)
+    fields = {
+        "trace_id": "trace_abc_1",
+        "service_name": "user-service",
+        "service_type": "web",
+        "start_time": start_time,
+        "end_time": start_time + timedelta(milliseconds=120),
+        "status": "error",
+        "parent_trace_id": "trace_abc_0",
+        "metadata": {"endpoint": "/api/v1/users", "http_method": "GET"},
+    }
+    fields.update(overrides)
+    return fields
+
+
+class ConstructTraceTest(unittest.TestCase):
+    """_construct_trace sets pydantic's instance attributes by hand; it must match model_construct."""
+
+    def assert_same_trace(self, constructed: Trace, expected: Trace):
+        self.assertEqual(constructed, expected)
+        self.assertEqual(constructed.model_dump_json(), expected.model_dump_json())
+        self.assertEqual(constructed.model_fields_set, expected.model_fields_set)
+        self.assertEqual(constructed.model_extra, expected.model_extra)
+        self.assertEqual(constructed.duration_seconds, expected.duration_seconds)
+
+    def test_matches_model_construct(self):
+        self.assert_same_trace(_construct_trace(**_trace_fields()), Trace.model_construct(**_trace_fields()))
+
+    def test_root_trace(self):
+        fields = _trace_fields(parent_trace_id=None, status="success", metadata={})
+        self.assert_same_trace(_construct_trace(**fields), Trace.model_construct(**fields))
+
+    def test_instance_attributes(self):
+        constructed = _construct_trace(**_trace_fields())
+        expected = Trace.model_construct(**_trace_fields())
+        for name in ("__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__"):
+            self.assertEqual(getattr(constructed, name), getattr(expected, name), name)
+
+    def test_model_copy(self):
+        constructed = _construct_trace(**_trace_fields())
+        expected = Trace.model_construct(**_trace_fields())
+        self.assert_same_trace(constructed.model_copy(), expected.model_copy())
+        self.assert_same_trace(
+            constructed.model_copy(update={"status": "success"}),
+            expected.model_copy(update={"status": "success"})
+        )
+        self.assert_same_trace(constructed.model_copy(deep=True), expected.model_copy(deep=True))
+
+    def test_pickle_round_trip(self):
+        constructed = _construct_trace(**_trace_fields())
+        self.assert_same_trace(pickle.loads(pickle.dumps(constructed)), constructed)
+        self.assert_same_trace(pickle.loads(pickle.dumps(constructed)), Trace.model_construct(**_trace_fields()))
+
+    def test_model_copy_with_new_end_time(self):
+        constructed = _construct_trace(**_trace_fields())
+        self.assertEqual(constructed.duration_seconds, 0.12)
+        new_end_time = constructed.start_time + timedelta(seconds=5)
+        self.assertEqual(constructed.model_copy(update={"end_time": new_end_time}).duration_seconds, 5.0)
+        
+        validated = Trace(**_trace_fields())
+        self.assertEqual(validated.duration_seconds, 0.12)
+        self.assertEqual(validated.model_copy(update={"end_time": new_end_time}).duration_seconds, 5.0)
+
+    def test_validates_like_a_model_built_trace(self):
+        constructed = _construct_trace(**_trace_fields())
+        self.assertEqual(Trace.model_validate_json(constructed.model_dump_json()), constructed)
+        self.assertEqual(Trace(**_trace_fields()), constructed)
+
+
+class PrettyPrintTracesTest(unittest.TestCase):
+    """pretty_print_traces caches formatted blocks on the view; each trace must keep its own block."""
+
+    def test_duplicate_trace_ids(self):
+        traces = [
+            Trace(**_trace_fields(trace_id="root-1", service_name="gateway", parent_trace_id=None)),
+            Trace(**_trace_fields(trace_id="dup", service_name="first-service", parent_trace_id="root-1")),
+            Trace(**_trace_fields(trace_id="dup", service_name="second-service", parent_trace_id=None)),
+        ]
+        view = prepare_for_display(traces)
+        for _ in range(2):
+            out = io.StringIO()
+            pretty_print_traces(view, file=out)
+            text = out.getvalue()
+            self.assertIn("  ├─ \033[1mfirst-service", text)
+            self.assertIn("\n├─ \033[1msecond-service", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
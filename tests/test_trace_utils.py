@@ -0,0 +1,233 @@
+"""Tests for the file helpers in trace_utils."""
+
+import csv
+import json
+import logging
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import trace_utils
+from trace_generator import Trace
+
+
+def _make_trace(trace_id: str, parent_trace_id: str = None, start_time: datetime = None) -> Trace:
+    """Build a minimal valid trace."""
+    if start_time is None:
+        start_time = datetime(2024, 1, 1, 12, 0, 0)
+    return Trace(
+        trace_id=trace_id,
+        service_name="svc",
+        service_type="web",
+        start_time=start_time,
+        end_time=start_time + timedelta(milliseconds=50),
+        status="success",
+        parent_trace_id=parent_trace_id
+    )
+
+
+class LoadTraceHierarchyFromNdjsonTest(unittest.TestCase):
+    """load_trace_hierarchy_from_ndjson must find the same traces as extract_trace_hierarchy."""
+
+    def setUp(self):
+        logging.getLogger(trace_utils.__name__).setLevel(logging.WARNING)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "traces.ndjson")
+
+    def assert_same_hierarchy(self, traces, root_trace_id):
+        trace_utils.save_to_ndjson(traces, self.path)
+        expected = trace_utils.extract_trace_hierarchy(traces, root_trace_id)
+        loaded = trace_utils.load_trace_hierarchy_from_ndjson(self.path, root_trace_id)
+        self.assertEqual(
+            sorted(trace.trace_id for trace in loaded),
+            sorted(trace.trace_id for trace in expected)
+        )
+        return loaded
+
+    def test_non_ascii_ids(self):
+        traces = [_make_trace("rôot"), _make_trace("chïld", "rôot"), _make_trace("other")]
+        loaded = self.assert_same_hierarchy(traces, "rôot")
+        self.assertEqual(len(loaded), 2)
+
+    def test_children_before_parents(self):
+        traces = [
+            _make_trace("grandchild", "child"),
+            _make_trace("child", "root"),
+            _make_trace("unrelated", "elsewhere"),
+            _make_trace("root"),
+        ]
+        loaded = self.assert_same_hierarchy(traces, "root")
+        self.assertEqual([trace.trace_id for trace in loaded], ["grandchild", "child", "root"])
+
+    def test_missing_root(self):
+        trace_utils.save_to_ndjson([_make_trace("root")], self.path)
+        self.assertEqual(trace_utils.load_trace_hierarchy_from_ndjson(self.path, "missing"), [])
+
+
+@unittest.skipUnless(trace_utils.pa is not None, "requires pyarrow")
+class SaveToCsvTest(unittest.TestCase):
+    """The pyarrow CSV writer must write the same values as the csv module writer."""
+
+    def setUp(self):
+        logging.getLogger(trace_utils.__name__).setLevel(logging.WARNING)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def read_both_writers(self, traces):
+        arrow_path = os.path.join(self.directory, "arrow.csv")
+        stdlib_path = os.path.join(self.directory, "stdlib.csv")
+        trace_utils.save_to_csv(traces, arrow_path)
+        with mock.patch.object(trace_utils, "pa", None):
+            trace_utils.save_to_csv(traces, stdlib_path)
+        with open(arrow_path, newline="") as arrow_file, open(stdlib_path, newline="") as stdlib_file:
+            return list(csv.DictReader(arrow_file)), list(csv.DictReader(stdlib_file))
+
+    def test_aware_times(self):
+        start_time = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=2)))
+        traces = [
+            _make_trace("root", start_time=start_time),
+            _make_trace("child", "root", start_time=start_time + timedelta(microseconds=250)),
+        ]
+        arrow_rows, stdlib_rows = self.read_both_writers(traces)
+        self.assertEqual(arrow_rows[0]["start_time"], "2024-01-01T12:00:00+02:00")
+        for arrow_row, stdlib_row in zip(arrow_rows, stdlib_rows):
+            self.assertEqual(float(arrow_row.pop("duration_seconds")), float(stdlib_row.pop("duration_seconds")))
+            self.assertEqual(arrow_row, stdlib_row)
+
+    def test_naive_times(self):
+        start_time = datetime(2024, 1, 1, 12, 0, 0)
+        traces = [
+            _make_trace("root", start_time=start_time),
+            _make_trace("child", "root", start_time=start_time + timedelta(microseconds=250)),
+        ]
+        arrow_rows, stdlib_rows = self.read_both_writers(traces)
+        for arrow_row, stdlib_row in zip(arrow_rows, stdlib_rows):
+            for column in ("start_time", "end_time"):
+                value = arrow_row.pop(column)
+                self.assertEqual(datetime.fromisoformat(value), datetime.fromisoformat(stdlib_row.pop(column)))
+            self.assertEqual(float(arrow_row.pop("duration_seconds")), float(stdlib_row.pop("duration_seconds")))
+            self.assertEqual(arrow_row, stdlib_row)
+
+
+class CanCopyTraceFileTest(unittest.TestCase):
+    """convert --no-regroup copies only JSON arrays that are already formatted as requested."""
+
+    def setUp(self):
+        logging.getLogger(trace_utils.__name__).setLevel(logging.WARNING)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.traces = [_make_trace("root"), _make_trace("child", "root")]
+
+    def write(self, name, pretty=True):
+        path = os.path.join(self.directory, name)
+        trace_utils.save_to_json(self.traces, path, pretty=pretty)
+        return path
+
+    def output(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_copies_json_with_matching_formatting(self):
+        pretty_file = self.write("pretty.json")
+        compact_file = self.write("compact.json", pretty=False)
+        self.assertTrue(trace_utils._can_copy_trace_file(pretty_file, self.output("out.json.gz"), pretty=True))
+        self.assertTrue(trace_utils._can_copy_trace_file(compact_file, self.output("out.json"), pretty=False))
+        
+        output_file = self.output("out.json.gz")
+        trace_utils._copy_trace_file(pretty_file, output_file)
+        self.assertEqual(trace_utils.load_from_json(output_file), self.traces)
+
+    def test_falls_through_on_other_formatting(self):
+        pretty_file = self.write("pretty.json")
+        compact_file = self.write("compact.json", pretty=False)
+        self.assertFalse(trace_utils._can_copy_trace_file(pretty_file, self.output("out.json"), pretty=False))
+        self.assertFalse(trace_utils._can_copy_trace_file(compact_file, self.output("out.json"), pretty=True))
+
+    def test_falls_through_for_other_formats(self):
+        json_file = self.write("traces.json")
+        ndjson_file = self.write("traces.ndjson")
+        self.assertFalse(trace_utils._can_copy_trace_file(ndjson_file, self.output("out.ndjson"), pretty=True))
+        self.assertFalse(trace_utils._can_copy_trace_file(ndjson_file, self.output("out.json"), pretty=True))
+        self.assertFalse(trace_utils._can_copy_trace_file(json_file, self.output("out.jsonl"), pretty=True))
+        self.assertFalse(trace_utils._can_copy_trace_file(json_file, self.output("out.csv"), pretty=True))
+
+
+class SaveToChromeTraceTest(unittest.TestCase):
+    """save_to_chrome_trace must write exact microsecond times and keep the trace fields in args."""
+
+    def setUp(self):
+        logging.getLogger(trace_utils.__name__).setLevel(logging.WARNING)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "traces.trace.json")
+
+    def load_events(self, traces):
+        trace_utils.save_to_chrome_trace(traces, self.path)
+        with open(self.path, encoding="utf-8") as f:
+            return [event for event in json.load(f)["traceEvents"] if event["ph"] == "X"]
+
+    def test_exact_microseconds(self):
+        # Past 2**53 microseconds a float timestamp() * 1e6 is no longer exact (it gives ...792 here)
+        start_time = datetime(3891, 9, 30, 11, 42, 1, 696789, tzinfo=timezone.utc)
+        before_epoch = datetime(1969, 12, 31, 23, 59, 59, 500001, tzinfo=timezone.utc)
+        events = self.load_events([
+            _make_trace("late", start_time=start_time),
+            _make_trace("early", start_time=before_epoch),
+        ])
+        self.assertEqual(events[0]["ts"], 60644461321696789)
+        self.assertEqual(events[1]["ts"], -499999)
+        self.assertEqual([event["dur"] for event in events], [50000, 50000])
+
+    def test_metadata_does_not_shadow_trace_fields(self):
+        trace = _make_trace("root").model_copy(update={"metadata": {"status": "overridden", "endpoint": "/api"}})
+        args = self.load_events([trace])[0]["args"]
+        self.assertEqual(args["trace_id"], "root")
+        self.assertEqual(args["status"], "success")
+        self.assertEqual(args["metadata"], {"status": "overridden", "endpoint": "/api"})
+
+
+@unittest.skipUnless(trace_utils.pa is not None, "requires pyarrow")
+class ParquetRoundTripTest(unittest.TestCase):
+    """load_from_parquet must give back the traces saved with save_to_parquet."""
+
+    def setUp(self):
+        logging.getLogger(trace_utils.__name__).setLevel(logging.WARNING)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "traces.parquet")
+
+    def assert_round_trip(self, traces):
+        trace_utils.save_to_parquet(traces, self.path)
+        loaded = trace_utils.load_from_parquet(self.path)
+        self.assertEqual(loaded, traces)
+        for loaded_trace, trace in zip(loaded, traces):
+            self.assertEqual(loaded_trace.start_time.isoformat(), trace.start_time.isoformat())
+            self.assertEqual(loaded_trace.end_time.isoformat(), trace.end_time.isoformat())
+
+    def test_naive_times(self):
+        self.assert_round_trip([_make_trace("root"), _make_trace("child", "root")])
+
+    def test_aware_times(self):
+        start_time = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=2)))
+        self.assert_round_trip([
+            _make_trace("root", start_time=start_time),
+            _make_trace("child", "root", start_time=start_time + timedelta(microseconds=250)),
+        ])
+
+    def test_mixed_times(self):
+        aware_time = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        with self.assertRaises(ValueError):
+            trace_utils.save_to_parquet([_make_trace("root"), _make_trace("other", start_time=aware_time)], self.path)
+        with self.assertRaises(ValueError):
+            trace_utils.save_to_parquet([
+                _make_trace("root", start_time=aware_time),
+                _make_trace("other", start_time=aware_time.astimezone(timezone(timedelta(hours=-5)))),
+            ], self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
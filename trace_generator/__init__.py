@@ -1,16 +1,92 @@
-from dataclasses import dataclass
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Set
+from typing import List, Dict, Optional, Tuple, Set, TextIO, Iterable, Iterator, Union
+import gc
+import itertools
+import os
 import random
+import sys
+import threading
 import numpy as np
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Number of root traces whose random numbers are drawn together in generate_traces_iter
+_BATCH_SIZE = 1024
+
+# Base span duration in seconds per service type
+_BASE_DURATIONS = {
+    "proxy": 0.1,
+    "web": 0.3,
+    "database": 0.2
+}
+
+# Metadata values, picked at random per trace
+_HTTP_METHODS = ("GET", "POST", "PUT", "DELETE")
+# Every possible endpoint, formatted once: API versions 1-3 x resources 1-100
+_ENDPOINTS = tuple(f"/api/v{version}/resource/{resource}" for version in range(1, 4) for resource in range(1, 101))
+_COMPONENTS = ("auth", "user", "order", "payment")
+_OPERATIONS = ("process", "validate", "transform")
+_QUERY_TYPES = ("SELECT", "INSERT", "UPDATE", "DELETE")
+_TABLES = ("users", "orders", "products", "inventory")
+
+# Every metadata combination per service type, built once; traces get a copy of a randomly
+# picked entry, which is the same as picking each value independently and uniformly
+_METADATA_POOLS = {
+    "proxy": tuple(
+        {"http_method": method, "endpoint": endpoint}
+        for method in _HTTP_METHODS for endpoint in _ENDPOINTS
+    ),
+    "web": tuple(
+        {"component": component, "operation": operation}
+        for component in _COMPONENTS for operation in _OPERATIONS
+    ),
+    "database": tuple(
+        {"query_type": query_type, "table": table}
+        for query_type in _QUERY_TYPES for table in _TABLES
+    ),
+}
+
+# Pool for service types without metadata
+_EMPTY_METADATA_POOL = ({},)
 
 class ServiceConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     service_type: str = Field(..., pattern="^(proxy|web|database)$")
-    connections: List[str] = Field(default_factory=list)
+    connections: Tuple[str, ...] = ()
+
+    @field_validator("name", "service_type")
+    @classmethod
+    def _intern_str(cls, value: str) -> str:
+        """Intern names and types so that traces and lookups share one string object."""
+        return sys.intern(value)
+
+    @field_validator("connections")
+    @classmethod
+    def _intern_connections(cls, value: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Intern connection names so they hit the identity fast path in dict lookups."""
+        return tuple(sys.intern(conn) for conn in value)
+
+    @classmethod
+    def from_spec_batch(cls, specs: Iterable[Tuple[str, str, Iterable[str]]]) -> List["ServiceConfig"]:
+        """
+        Build a list of services from compact (name, service_type, connections) tuples.
+        
+        Args:
+            specs: Iterable of (name, service_type, connections) tuples
+            
+        Returns:
+            List of ServiceConfig objects, in the same order as the specs
+        """
+        return [cls(name=name, service_type=service_type, connections=tuple(connections))
+                for name, service_type, connections in specs]
 
 class Trace(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     trace_id: str
     service_name: str
     service_type: str
@@ -20,6 +96,73 @@ class Trace(BaseModel):
     parent_trace_id: Optional[str] = None
     metadata: Dict[str, str] = Field(default_factory=dict)
 
+    @field_validator("service_name", "service_type", "status")
+    @classmethod
+    def _intern_str(cls, value: str) -> str:
+        """Intern service names, types and statuses, which come from a small set, e.g. when loading from a file."""
+        return sys.intern(value)
+
+    @property
+    def duration_seconds(self) -> float:
+        """Duration of the trace in seconds, derived from the start and end times on each access."""
+        return (self.end_time - self.start_time).total_seconds()
+
+def _construct_trace(**fields) -> Trace:
+    """
+    Build a Trace from values that are known to be valid, without validation.
+    
+    Same as Trace.model_construct when every field is given, minus its per-call
+    default filling and bookkeeping, which dominate the cost of generating traces.
+    It sets pydantic's private instance attributes directly, so pydantic is pinned to
+    tested versions in requirements.txt and tests/test_trace_generator.py checks the
+    result against model_construct.
+    """
+    trace = Trace.__new__(Trace)
+    object.__setattr__(trace, "__dict__", fields)
+    object.__setattr__(trace, "__pydantic_fields_set__", set(fields))
+    object.__setattr__(trace, "__pydantic_extra__", None)
+    object.__setattr__(trace, "__pydantic_private__", None)
+    return trace
+
+# Number of _gc_paused blocks running, and whether the collector was enabled before the first
+_gc_pause_lock = threading.Lock()
+_gc_pause_depth = 0
+_gc_was_enabled = False
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Pause the cyclic garbage collector while a block runs (see TraceGenerator.generate_traces).
+    
+    Nested or concurrent blocks are counted, so the collector is only restored, to the
+    state it had when the first block started, once the last block ends.
+    """
+    global _gc_pause_depth, _gc_was_enabled
+    with _gc_pause_lock:
+        if _gc_pause_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_depth -= 1
+            if _gc_pause_depth == 0 and _gc_was_enabled:
+                gc.enable()
+
+@dataclass
+class TraceDisplayView:
+    """Traces grouped by hierarchy once, so they can be pretty printed repeatedly."""
+    traces: List[Trace]
+    root_traces: List[Trace]
+    traces_by_parent: Dict[str, List[Trace]]
+    success_count: int
+    # Formatted output per (id(trace), level), filled in lazily by pretty_print_traces; keyed
+    # by object rather than trace ID since IDs are not guaranteed unique, and by level since
+    # the block includes its indentation (the view keeps the traces alive, so ids stay valid)
+    formatted: Dict[Tuple[int, int], str] = field(default_factory=dict)
+
 class TraceGenerator:
     def __init__(
         self,
@@ -32,6 +175,37 @@ class TraceGenerator:
         self.num_groups = max(1, num_groups)
         self._validate_connections()
         
+        # Per-group duration factors and success thresholds, indexed by group
+        self._group_factors = tuple(
+            1.0 + (group / self.num_groups) * 0.5 for group in range(self.num_groups)
+        )
+        self._success_thresholds = tuple(
+            (0.95 - (group / self.num_groups) * 0.1) * (1 - self.randomization_level)
+            for group in range(self.num_groups)
+        )
+        
+        # Trace IDs are a random per-generator prefix plus a counter, so they stay
+        # unique across generators and processes without a clock read per trace
+        self._id_prefix = f"trace_{os.urandom(6).hex()}_"
+        self._id_counter = itertools.count()
+        
+        # Traces start at the first proxy service; resolve it and its connections once
+        self._proxy_service = next((s for s in self.services.values() if s.service_type == "proxy"), None)
+        self._proxy_connections = tuple(
+            self.services[conn_name] for conn_name in self._proxy_service.connections
+        ) if self._proxy_service is not None else ()
+        
+        # Metadata pool for each span, so generation does not branch on service type
+        self._span_metadata_pools = (_METADATA_POOLS["proxy"],) + tuple(
+            _METADATA_POOLS.get(s.service_type, _EMPTY_METADATA_POOL) for s in self._proxy_connections
+        )
+        self._span_metadata_pool_sizes = np.array([len(pool) for pool in self._span_metadata_pools])
+        
+        # Base duration of each span in a generated trace: the proxy, then its connections
+        self._span_base_durations = np.array(
+            [_BASE_DURATIONS["proxy"]] + [_BASE_DURATIONS[s.service_type] for s in self._proxy_connections]
+        )
+        
     def _validate_connections(self):
         """Validate that all service connections exist."""
         for service in self.services.values():
@@ -41,43 +215,41 @@ class TraceGenerator:
 
     def _generate_trace_id(self) -> str:
         """Generate a unique trace ID."""
-        return f"trace_{random.randint(1000, 9999)}_{datetime.now().timestamp()}"
-
-    def _generate_duration(self, service_type: str, group: int) -> float:
-        """Generate duration based on service type and group."""
-        base_durations = {
-            "proxy": 0.1,
-            "web": 0.3,
-            "database": 0.2
-        }
-        
-        base_duration = base_durations[service_type]
-        group_factor = 1.0 + (group / self.num_groups) * 0.5
-        random_factor = 1.0 + (random.random() - 0.5) * self.randomization_level
-        
-        return base_duration * group_factor * random_factor
-
-    def _generate_status(self, group: int) -> str:
-        """Generate status based on group and randomization."""
-        base_success_rate = 0.95 - (group / self.num_groups) * 0.1
-        success_rate = base_success_rate * (1 - self.randomization_level)
-        return "success" if random.random() < success_rate else "error"
-
-    def _generate_metadata(self, service_type: str) -> Dict[str, str]:
-        """Generate metadata based on service type."""
-        metadata = {}
-        if service_type == "proxy":
-            metadata["http_method"] = random.choice(["GET", "POST", "PUT", "DELETE"])
-            metadata["endpoint"] = f"/api/v{random.randint(1, 3)}/resource/{random.randint(1, 100)}"
-        elif service_type == "web":
-            metadata["component"] = random.choice(["auth", "user", "order", "payment"])
-            metadata["operation"] = random.choice(["process", "validate", "transform"])
-        elif service_type == "database":
-            metadata["query_type"] = random.choice(["SELECT", "INSERT", "UPDATE", "DELETE"])
-            metadata["table"] = random.choice(["users", "orders", "products", "inventory"])
-        return metadata
-
-    def _create_trace(self, trace_id: str, service_name: str, service_type: str, parent_trace_id: Optional[str] = None) -> Trace:
+        return self._id_prefix + format(next(self._id_counter), "x")
+
+    def _generate_duration(self, service_type: str, group: int, draw: Optional[float] = None) -> float:
+        """
+        Generate duration based on service type and group.
+        
+        draw is a uniform sample in [0, 1), e.g. pre-drawn in bulk; one is taken
+        from the random module if it is omitted.
+        """
+        if draw is None:
+            draw = random.random()
+        random_factor = 1.0 + (draw - 0.5) * self.randomization_level
+        return _BASE_DURATIONS[service_type] * self._group_factors[group] * random_factor
+
+    def _generate_status(self, group: int, draw: Optional[float] = None) -> str:
+        """Generate status based on group and randomization (draw as for _generate_duration)."""
+        if draw is None:
+            draw = random.random()
+        return "success" if draw < self._success_thresholds[group] else "error"
+
+    def _generate_metadata(self, service_type: str, draw: Optional[float] = None) -> Dict[str, str]:
+        """Generate metadata based on service type (draw as for _generate_duration)."""
+        if draw is None:
+            draw = random.random()
+        pool = _METADATA_POOLS.get(service_type, _EMPTY_METADATA_POOL)
+        return pool[int(draw * len(pool))].copy()
+
+    def _create_trace(
+        self,
+        trace_id: str,
+        service_name: str,
+        service_type: str,
+        parent_trace_id: Optional[str] = None,
+        base_time: Optional[datetime] = None
+    ) -> Trace:
         """
         Create a single trace with specific parameters, useful for manually building complex hierarchies.
         
@@ -86,20 +258,24 @@ class TraceGenerator:
             service_name: Name of the service
             service_type: Type of the service (proxy, web, database)
             parent_trace_id: Optional parent trace ID
+            base_time: Time the random start offset is added to (defaults to now). When
+                creating many traces, read the clock once and pass it to every call.
             
         Returns:
             A new Trace object
         """
+        if base_time is None:
+            base_time = datetime.now()
         group = random.randint(0, self.num_groups - 1)
-        start_time = datetime.now() + timedelta(seconds=random.random() * 3600)
+        start_time = base_time + timedelta(seconds=random.random() * 3600)
         duration = self._generate_duration(service_type, group)
         status = self._generate_status(group)
         metadata = self._generate_metadata(service_type)
         
-        return Trace(
+        return _construct_trace(
             trace_id=trace_id,
-            service_name=service_name,
-            service_type=service_type,
+            service_name=sys.intern(service_name),
+            service_type=sys.intern(service_type),
             start_time=start_time,
             end_time=start_time + timedelta(seconds=duration),
             status=status,
@@ -107,128 +283,249 @@ class TraceGenerator:
             metadata=metadata
         )
 
-    def generate_traces(self, num_traces: int = 100) -> List[Trace]:
-        """Generate a list of traces."""
-        traces = []
-        base_time = datetime.now()
+    def generate_traces(self, num_traces: int = 100, pause_gc: bool = False) -> List[Trace]:
+        """
+        Generate a list of traces.
         
-        for _ in range(num_traces):
-            group = random.randint(0, self.num_groups - 1)
-            trace_id = self._generate_trace_id()
+        Args:
+            num_traces: Number of root traces to generate
+            pause_gc: Whether to pause the cyclic garbage collector while the list is built.
+                Every collection triggered by the allocations traverses all the traces built
+                so far, which can double the generation time of large lists; traces hold no
+                reference cycles, so nothing is left uncollected. The collector is shared by
+                the whole process, so only pass True where nothing else relies on it running
+                meanwhile (e.g. a script or a worker process).
             
-            # Start with a proxy service
-            proxy_service = next(s for s in self.services.values() if s.service_type == "proxy")
-            start_time = base_time + timedelta(seconds=random.random() * 3600)
+        Returns:
+            List of generated Trace objects in hierarchical order
+        """
+        if not pause_gc:
+            return list(self.generate_traces_iter(num_traces))
+        with _gc_paused():
+            return list(self.generate_traces_iter(num_traces))
+
+    def generate_traces_iter(self, num_traces: int = 100) -> Iterator[Trace]:
+        """
+        Lazily generate traces, one at a time.
+        
+        Each root trace is yielded before its child traces, so consumers that only
+        need the first few hierarchies can stop early without generating the rest.
+        
+        Args:
+            num_traces: Number of root traces to generate
             
-            # Generate proxy trace
-            proxy_duration = self._generate_duration("proxy", group)
-            proxy_trace = Trace(
-                trace_id=trace_id,
-                service_name=proxy_service.name,
-                service_type="proxy",
-                start_time=start_time,
-                end_time=start_time + timedelta(seconds=proxy_duration),
-                status=self._generate_status(group),
-                metadata=self._generate_metadata("proxy")
-            )
-            traces.append(proxy_trace)
+        Yields:
+            Trace objects in hierarchical order
+        """
+        # Times are computed as int64 microsecond offsets from base_time (the
+        # resolution of datetime) and only converted to datetimes at the end
+        base_time = np.datetime64(datetime.now(), "us")
+        
+        # Start with a proxy service
+        proxy_service = self._proxy_service
+        if proxy_service is None:
+            raise ValueError("Cannot generate traces: the topology has no proxy service")
+        conn_services = self._proxy_connections
+        proxy_metadata_pool, *conn_metadata_pools = self._span_metadata_pools
+        num_spans = 1 + len(conn_services)
+        base_durations = self._span_base_durations
+        
+        # Draw random numbers in bulk with NumPy, seeded from the random module so
+        # that random.seed() still makes the generated traces reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        group_factors = np.array(self._group_factors)
+        success_thresholds = np.array(self._success_thresholds)
+        
+        for batch_start in range(0, num_traces, _BATCH_SIZE):
+            batch_size = min(_BATCH_SIZE, num_traces - batch_start)
+            group_array = rng.integers(0, self.num_groups, size=batch_size)
+            start_offsets = rng.random(batch_size) * 3600
+            duration_draws = rng.random((batch_size, num_spans))
+            status_draws = rng.random((batch_size, num_spans))
+            metadata_draws = rng.random((batch_size, num_spans))
             
-            # Generate traces for connected services
-            current_time = start_time + timedelta(seconds=proxy_duration)
-            for conn_name in proxy_service.connections:
-                conn_service = self.services[conn_name]
-                conn_duration = self._generate_duration(conn_service.service_type, group)
+            # Durations and statuses for the whole batch, with the same formulas as
+            # _generate_duration and _generate_status (one row per root trace)
+            random_factor = 1.0 + (duration_draws - 0.5) * self.randomization_level
+            durations = base_durations * group_factors[group_array][:, np.newaxis] * random_factor
+            successes = (status_draws < success_thresholds[group_array][:, np.newaxis]).tolist()
+            metadata_indices = (metadata_draws * self._span_metadata_pool_sizes).astype(np.int64).tolist()
+            
+            # Each span starts when the previous one in the trace ends
+            durations_us = np.rint(durations * 1e6).astype(np.int64)
+            trace_starts_us = np.rint(start_offsets * 1e6).astype(np.int64)[:, np.newaxis]
+            span_starts_us = trace_starts_us + np.cumsum(durations_us, axis=1) - durations_us
+            start_times = (base_time + span_starts_us).tolist()
+            end_times = (base_time + (span_starts_us + durations_us)).tolist()
+            
+            for i in range(batch_size):
+                trace_id = self._generate_trace_id()
                 
-                conn_trace = Trace(
-                    trace_id=self._generate_trace_id(),
-                    service_name=conn_service.name,
-                    service_type=conn_service.service_type,
-                    start_time=current_time,
-                    end_time=current_time + timedelta(seconds=conn_duration),
-                    status=self._generate_status(group),
-                    parent_trace_id=trace_id,
-                    metadata=self._generate_metadata(conn_service.service_type)
+                # Generate proxy trace
+                # Generated values are valid by construction, so skip pydantic validation
+                proxy_trace = _construct_trace(
+                    trace_id=trace_id,
+                    service_name=proxy_service.name,
+                    service_type="proxy",
+                    start_time=start_times[i][0],
+                    end_time=end_times[i][0],
+                    status="success" if successes[i][0] else "error",
+                    parent_trace_id=None,
+                    metadata=proxy_metadata_pool[metadata_indices[i][0]].copy()
                 )
-                traces.append(conn_trace)
+                yield proxy_trace
                 
-                # Recursively generate traces for connected services
-                current_time += timedelta(seconds=conn_duration)
+                # Generate traces for connected services
+                for j, (conn_service, metadata_pool) in enumerate(zip(conn_services, conn_metadata_pools), 1):
+                    conn_trace = _construct_trace(
+                        trace_id=self._generate_trace_id(),
+                        service_name=conn_service.name,
+                        service_type=conn_service.service_type,
+                        start_time=start_times[i][j],
+                        end_time=end_times[i][j],
+                        status="success" if successes[i][j] else "error",
+                        parent_trace_id=trace_id,
+                        metadata=metadata_pool[metadata_indices[i][j]].copy()
+                    )
+                    yield conn_trace
         
-        return traces
+    def prepare_for_display(self, traces: List[Trace]) -> TraceDisplayView:
+        """Group traces by hierarchy once for display (see the module-level prepare_for_display)."""
+        return prepare_for_display(traces)
         
-    def pretty_print_traces(self, traces: List[Trace], max_traces: int = 10):
-        """
-        Print traces in a readable hierarchical format to visualize the service topology.
+    def pretty_print_traces(
+        self,
+        traces: Union[List[Trace], TraceDisplayView],
+        max_traces: int = 10,
+        file: Optional[TextIO] = None
+    ):
+        """Print traces in a readable hierarchical format (see the module-level pretty_print_traces)."""
+        pretty_print_traces(traces, max_traces=max_traces, file=file)
+
+
+def prepare_for_display(traces: List[Trace]) -> TraceDisplayView:
+    """
+    Group traces by hierarchy once for display.
+    
+    The returned view can be passed to pretty_print_traces any number of times
+    (e.g. with different max_traces values) without regrouping the traces.
+    
+    Args:
+        traces: List of Trace objects to display
+    
+    Returns:
+        A TraceDisplayView over the traces
+    """
+    # Group traces by their root trace (those without parent)
+    traces_by_parent = defaultdict(list)
+    root_traces = []
+    
+    for trace in traces:
+        parent_trace_id = trace.parent_trace_id
+        if parent_trace_id is None:
+            root_traces.append(trace)
+        else:
+            traces_by_parent[parent_trace_id].append(trace)
+    
+    success_count = sum(trace.status == "success" for trace in traces)
+    
+    return TraceDisplayView(
+        traces=traces,
+        root_traces=root_traces,
+        traces_by_parent=traces_by_parent,
+        success_count=success_count
+    )
+
+
+def pretty_print_traces(
+    traces: Union[List[Trace], TraceDisplayView],
+    max_traces: int = 10,
+    file: Optional[TextIO] = None
+):
+    """
+    Print traces in a readable hierarchical format to visualize the service topology.
+    
+    Args:
+        traces: List of Trace objects to print, or a view from prepare_for_display
+        max_traces: Maximum number of top-level traces to print (to avoid console overflow)
+        file: Optional text stream to write to (defaults to sys.stdout). Pass an
+            io.StringIO to batch the output and write it out in one go.
+    """
+    out = file if file is not None else sys.stdout
+    view = traces if isinstance(traces, TraceDisplayView) else prepare_for_display(traces)
+    
+    if not view.traces:
+        print("No traces to display.", file=out)
+        return
+    
+    # Colors for status
+    GREEN = "\033[92m"
+    RED = "\033[91m"
+    BOLD = "\033[1m"
+    RESET = "\033[0m"
+    
+    root_traces = view.root_traces
+    traces_by_parent = view.traces_by_parent
+    formatted = view.formatted
+    
+    # Stats
+    total_traces = len(view.traces)
+    success_count = view.success_count
+    error_count = total_traces - success_count
+    
+    # Collect all output and write it in one go at the end
+    parts = [
+        f"\n{BOLD}=== Trace Topology Summary ==={RESET}\n",
+        f"Total traces: {total_traces}\n",
+        f"Success: {GREEN}{success_count}{RESET} ({success_count/total_traces*100:.1f}%)\n",
+        f"Error: {RED}{error_count}{RESET} ({error_count/total_traces*100:.1f}%)\n",
+        f"Root traces: {len(root_traces)}\n",
+        f"Displaying first {min(max_traces, len(root_traces))} root traces\n\n",
+    ]
+    
+    # Print trace hierarchies
+    displayed_count = 0
+    for root_trace in root_traces[:max_traces]:
+        displayed_count += 1
+        parts.append(f"{BOLD}Trace Topology #{displayed_count}{RESET}\n")
         
-        Args:
-            traces: List of Trace objects to print
-            max_traces: Maximum number of top-level traces to print (to avoid console overflow)
-        """
-        if not traces:
-            print("No traces to display.")
-            return
-        
-        # Colors for status
-        GREEN = "\033[92m"
-        RED = "\033[91m"
-        BOLD = "\033[1m"
-        RESET = "\033[0m"
-        
-        # Group traces by their root trace (those without parent)
-        trace_map = {trace.trace_id: trace for trace in traces}
-        traces_by_parent = {}
-        root_traces = []
-        
-        for trace in traces:
-            if trace.parent_trace_id is None:
-                root_traces.append(trace)
-            else:
-                if trace.parent_trace_id not in traces_by_parent:
-                    traces_by_parent[trace.parent_trace_id] = []
-                traces_by_parent[trace.parent_trace_id].append(trace)
-        
-        # Stats
-        total_traces = len(traces)
-        success_count = sum(1 for trace in traces if trace.status == "success")
-        error_count = total_traces - success_count
-        
-        # Print summary
-        print(f"\n{BOLD}=== Trace Topology Summary ==={RESET}")
-        print(f"Total traces: {total_traces}")
-        print(f"Success: {GREEN}{success_count}{RESET} ({success_count/total_traces*100:.1f}%)")
-        print(f"Error: {RED}{error_count}{RESET} ({error_count/total_traces*100:.1f}%)")
-        print(f"Root traces: {len(root_traces)}")
-        print(f"Displaying first {min(max_traces, len(root_traces))} root traces\n")
-        
-        # Print trace hierarchies
-        displayed_count = 0
-        for root_trace in root_traces[:max_traces]:
-            displayed_count += 1
-            print(f"{BOLD}Trace Topology #{displayed_count}{RESET}")
+        # Print depth-first with proper indentation, using an explicit stack of (trace, level)
+        stack = [(root_trace, 0)]
+        while stack:
+            trace, level = stack.pop()
             
-            # Print recursively with proper indentation
-            def print_trace(trace, level=0):
+            # Reuse the block formatted by an earlier call on the same view
+            key = (id(trace), level)
+            block = formatted.get(key)
+            if block is None:
                 indent = "  " * level
-                duration = (trace.end_time - trace.start_time).total_seconds()
+                duration = trace.duration_seconds
                 status_color = GREEN if trace.status == "success" else RED
                 
-                print(f"{indent}├─ {BOLD}{trace.service_name}{RESET} ({trace.service_type})")
-                print(f"{indent}│  Status: {status_color}{trace.status}{RESET}")
-                print(f"{indent}│  Duration: {duration:.3f}s")
-                print(f"{indent}│  ID: {trace.trace_id}")
+                lines = [
+                    f"{indent}├─ {BOLD}{trace.service_name}{RESET} ({trace.service_type})",
+                    f"{indent}│  Status: {status_color}{trace.status}{RESET}",
+                    f"{indent}│  Duration: {duration:.3f}s",
+                    f"{indent}│  ID: {trace.trace_id}",
+                ]
                 
                 # Print important metadata
                 if trace.metadata:
                     metadata_str = ", ".join(f"{k}={v}" for k, v in trace.metadata.items())
-                    print(f"{indent}│  Metadata: {metadata_str}")
+                    lines.append(f"{indent}│  Metadata: {metadata_str}")
                 
-                # Print child traces
-                if trace.trace_id in traces_by_parent:
-                    for child in traces_by_parent[trace.trace_id]:
-                        print_trace(child, level + 1)
+                block = "\n".join(lines) + "\n"
+                formatted[key] = block
+            parts.append(block)
             
-            print_trace(root_trace)
-            print()
+            # Print child traces next, pushed in reverse so they pop in their original order
+            children = traces_by_parent.get(trace.trace_id)
+            if children:
+                stack.extend((child, level + 1) for child in reversed(children))
         
-        if len(root_traces) > max_traces:
-            print(f"... and {len(root_traces) - max_traces} more root traces (not displayed)") 
\ No newline at end of file
+        parts.append("\n")
+    
+    if len(root_traces) > max_traces:
+        parts.append(f"... and {len(root_traces) - max_traces} more root traces (not displayed)\n")
+    
+    out.write("".join(parts))
@@ -7,14 +7,152 @@ These utilities allow for generating larger datasets suitable for analysis and t
 """
 
 import os
+import io
+import gzip
 import json
 import csv
 import argparse
-from datetime import datetime
-from typing import List, Dict, Optional, Union, Any
+import logging
+import shutil
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Union, Any, Iterable, Iterator, Tuple
 import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice, repeat
 
-from trace_generator import ServiceConfig, Trace, TraceGenerator
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional dependency, fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pa_compute
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # optional dependency, fall back to the stdlib csv writer (no Parquet support)
+    pa = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency, only needed for .zst files
+    zstandard = None
+
+from pydantic import TypeAdapter
+
+from trace_generator import ServiceConfig, Trace, TraceGenerator, pretty_print_traces
+
+# Progress and status messages (files saved and loaded, generation steps); the
+# command-line interface shows them on stdout unless --quiet is given
+logger = logging.getLogger(__name__)
+
+# Serializers for whole service topologies and trace lists
+_TOPOLOGY_ADAPTER = TypeAdapter(List[ServiceConfig])
+_TRACES_ADAPTER = TypeAdapter(List[Trace])
+
+# Buffer size for files written or read in many small rows (CSV, NDJSON), so that rows
+# cross the kernel boundary in a few large write()/read() calls rather than one per 8 KiB
+# (JSON arrays, Chrome traces and topologies are written as a single bytes object anyway)
+_IO_BUFFER_SIZE = 1024 * 1024
+
+# Traces serialized per call when writing a JSON array, so that a lazy iterable of
+# traces is written in bounded memory
+_JSON_BATCH_SIZE = 1024
+
+# File extensions read and written as newline-delimited JSON, one trace per line
+_NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+# File extensions that are compressed and decompressed transparently (e.g. traces.json.gz)
+_COMPRESSED_EXTENSIONS = (".gz", ".zst")
+
+
+def _open_file(path: str, mode: str, newline: Optional[str] = None):
+    """
+    Open a file, compressing or decompressing it transparently if its name ends in .gz or .zst.
+    
+    Args:
+        path: Path to the file
+        mode: File mode, e.g. 'rb', 'wb' or 'w' (text)
+        newline: Newline handling for text modes, as for open()
+        
+    Returns:
+        File object, to be used as a context manager
+    """
+    if path.endswith(".gz"):
+        # Fastest gzip level: trace files compress well even so
+        return gzip.open(path, mode if "b" in mode else mode + "t", compresslevel=1, newline=newline)
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise ImportError("Reading or writing .zst files requires the zstandard package (pip install zstandard)")
+        # Compress on all CPU cores
+        f = zstandard.open(path, mode, cctx=zstandard.ZstdCompressor(level=3, threads=-1), newline=newline)
+        if mode == 'rb':
+            # The raw decompression reader cannot be iterated line by line
+            f = io.BufferedReader(f, buffer_size=_IO_BUFFER_SIZE)
+        return f
+    
+    f = open(path, mode, buffering=_IO_BUFFER_SIZE, newline=newline)
+    if "r" in mode and hasattr(os, "posix_fadvise"):
+        # Trace files are read front to back: let the kernel read ahead more aggressively
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return f
+
+
+def _strip_compression_extension(path: str) -> str:
+    """Return a path without its .gz or .zst extension, if it has one."""
+    root, extension = os.path.splitext(path)
+    return root if extension in _COMPRESSED_EXTENSIONS else path
+
+
+def _is_ndjson_path(path: str) -> bool:
+    """Return whether a path names a newline-delimited JSON file, possibly compressed."""
+    return _strip_compression_extension(path).endswith(_NDJSON_EXTENSIONS)
+
+
+def _can_copy_trace_file(input_file: str, output_file: str, pretty: bool) -> bool:
+    """
+    Return whether a trace file can be converted, without regrouping, by copying its contents.
+    
+    Only a JSON array converted to JSON is copied, and the decision is taken from the
+    first two bytes of the input alone: the traces themselves are not validated.
+    
+    Args:
+        input_file: Path to the input JSON or NDJSON file
+        output_file: Path to the output file
+        pretty: Whether the output JSON should be formatted with indentation
+        
+    Returns:
+        True if both files are JSON arrays (ignoring compression) and the input is
+        already formatted (or not) with indentation as requested
+    """
+    # ".ndjson" also ends with ".json"
+    if _is_ndjson_path(input_file) or _is_ndjson_path(output_file):
+        return False
+    if not (_strip_compression_extension(input_file).endswith(".json")
+            and _strip_compression_extension(output_file).endswith(".json")):
+        return False
+    
+    # Arrays written with indentation start with "[\n", compact ones with "[{" (or are "[]")
+    with _open_file(input_file, 'rb') as f:
+        head = f.read(2)
+    return head == b"[]" or (head == b"[\n") == pretty
+
+
+def _copy_trace_file(input_file: str, output_file: str) -> None:
+    """Copy a trace file in chunks, decompressing and compressing it as the file names require."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    with _open_file(input_file, 'rb') as source, _open_file(output_file, 'wb') as destination:
+        shutil.copyfileobj(source, destination, _IO_BUFFER_SIZE)
+
+
+def _dumps_json(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None).encode("utf-8")
 
 
 def generate_dataset(
@@ -22,7 +160,8 @@ def generate_dataset(
     num_traces: int = 1000,
     randomization_level: float = 0.3,
     num_groups: int = 3,
-    seed: Optional[int] = None
+    seed: Optional[int] = None,
+    pause_gc: bool = False
 ) -> List[Trace]:
     """
     Generate a dataset of traces based on the provided service configuration.
@@ -33,6 +172,8 @@ def generate_dataset(
         randomization_level: Level of randomization (0.0 to 1.0)
         num_groups: Number of performance groups
         seed: Random seed for reproducibility
+        pause_gc: Whether to pause the process-wide cyclic garbage collector while
+            generating (faster for large datasets, see TraceGenerator.generate_traces)
     
     Returns:
         List of generated Trace objects
@@ -41,66 +182,182 @@ def generate_dataset(
         random.seed(seed)
     
     generator = TraceGenerator(services, randomization_level, num_groups)
-    traces = generator.generate_traces(num_traces)
-    
-    return traces
+    return generator.generate_traces(num_traces, pause_gc=pause_gc)
 
 
-def save_to_json(traces: List[Trace], output_file: str, pretty: bool = True) -> None:
+def generate_dataset_iter(
+    services: List[ServiceConfig],
+    num_traces: int = 1000,
+    randomization_level: float = 0.3,
+    num_groups: int = 3,
+    seed: Optional[int] = None
+) -> Iterator[Trace]:
     """
-    Save traces to a JSON file.
+    Lazily generate a dataset of traces, e.g. to stream it to disk with save_to_ndjson.
     
     Args:
-        traces: List of Trace objects to save
-        output_file: Path to the output file
-        pretty: Whether to format the JSON with indentation (pretty print)
+        services: List of ServiceConfig objects defining the service topology
+        num_traces: Number of traces to generate
+        randomization_level: Level of randomization (0.0 to 1.0)
+        num_groups: Number of performance groups
+        seed: Random seed for reproducibility (applied when iteration starts)
+    
+    Yields:
+        Generated Trace objects in hierarchical order
     """
-    # Create output directory if it doesn't exist
-    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    if seed is not None:
+        random.seed(seed)
     
-    # Group traces by hierarchy to ensure related traces are together
-    grouped_traces = []
-    trace_map = {trace.trace_id: trace for trace in traces}
+    generator = TraceGenerator(services, randomization_level, num_groups)
+    yield from generator.generate_traces_iter(num_traces)
+
+
+def generate_dataset_parallel(
+    services: List[ServiceConfig],
+    num_traces: int = 1000,
+    randomization_level: float = 0.3,
+    num_groups: int = 3,
+    seed: Optional[int] = None,
+    num_shards: int = 8,
+    max_workers: Optional[int] = None
+) -> List[Trace]:
+    """
+    Generate a dataset of traces across worker processes.
     
-    # Find root traces (those without parents)
-    root_traces = [trace for trace in traces if trace.parent_trace_id is None]
+    The traces are split into num_shards shards, each generated with its own seed
+    derived from seed via numpy's SeedSequence. The result depends only on seed and
+    num_shards (not on the number of workers), but differs from generate_dataset
+    with the same seed.
     
-    # Build a child map to easily find children of a trace
+    Args:
+        services: List of ServiceConfig objects defining the service topology
+        num_traces: Number of traces to generate
+        randomization_level: Level of randomization (0.0 to 1.0)
+        num_groups: Number of performance groups
+        seed: Random seed for reproducibility
+        num_shards: Number of independently seeded shards to split the traces into
+        max_workers: Maximum number of worker processes (defaults to the CPU count)
+    
+    Returns:
+        List of generated Trace objects, shard by shard
+    """
+    num_shards = max(1, min(num_shards, num_traces))
+    shard_sizes = [num_traces // num_shards + (i < num_traces % num_shards) for i in range(num_shards)]
+    shard_seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(num_shards)]
+    
+    with ProcessPoolExecutor(max_workers=min(num_shards, max_workers or os.cpu_count() or 1)) as executor:
+        # The worker processes do nothing else, so they can pause the garbage collector
+        shards = executor.map(
+            generate_dataset,
+            repeat(services), shard_sizes, repeat(randomization_level), repeat(num_groups), shard_seeds,
+            repeat(True)
+        )
+        return [trace for shard in shards for trace in shard]
+
+
+def build_child_map(traces: Iterable[Trace]) -> Dict[str, List[Trace]]:
+    """
+    Index traces by their parent trace ID in a single pass.
+    
+    Args:
+        traces: Iterable of Trace objects
+        
+    Returns:
+        Dictionary mapping each parent trace ID to its child traces, in input order
+    """
     child_map = {}
     for trace in traces:
         if trace.parent_trace_id:
             if trace.parent_trace_id not in child_map:
                 child_map[trace.parent_trace_id] = []
             child_map[trace.parent_trace_id].append(trace)
+    return child_map
+
+
+def iter_hierarchy(root_trace: Trace, child_map: Dict[str, List[Trace]]) -> Iterator[Tuple[Trace, int]]:
+    """
+    Walk a trace hierarchy depth-first, parents before their children.
     
-    # Recursive function to collect traces in hierarchical order
-    def collect_traces(trace):
-        collected = [trace]
-        if trace.trace_id in child_map:
-            for child in child_map[trace.trace_id]:
-                collected.extend(collect_traces(child))
-        return collected
+    Args:
+        root_trace: The trace to start from
+        child_map: Child index from build_child_map
+        
+    Yields:
+        (trace, level) tuples, where the root trace is at level 0
+    """
+    stack = [(root_trace, 0)]
+    while stack:
+        trace, level = stack.pop()
+        yield trace, level
+        children = child_map.get(trace.trace_id)
+        if children:
+            # Push in reverse so children come out in their original order
+            stack.extend((child, level + 1) for child in reversed(children))
+
+
+def _group_by_hierarchy(traces: List[Trace]) -> List[Trace]:
+    """Order traces so each root trace is followed by its whole hierarchy."""
+    child_map = build_child_map(traces)
     
-    # Collect all traces in proper hierarchical order
-    for root_trace in root_traces:
-        grouped_traces.extend(collect_traces(root_trace))
+    # Same depth-first walk as iter_hierarchy, over all roots with one stack and without
+    # tracking levels; roots are pushed in reverse so they come out in their original order
+    grouped_traces = []
+    stack = [trace for trace in reversed(traces) if trace.parent_trace_id is None]
+    while stack:
+        trace = stack.pop()
+        grouped_traces.append(trace)
+        children = child_map.get(trace.trace_id)
+        if children:
+            stack.extend(reversed(children))
+    return grouped_traces
+
+
+def save_to_json(traces: Iterable[Trace], output_file: str, pretty: bool = True, group: bool = True) -> None:
+    """
+    Save traces to a JSON file.
     
-    # Convert traces to dictionaries, with datetime objects converted to ISO format
-    trace_dicts = []
-    for trace in grouped_traces:
-        trace_dict = trace.model_dump()
-        trace_dict["start_time"] = trace_dict["start_time"].isoformat()
-        trace_dict["end_time"] = trace_dict["end_time"].isoformat()
-        trace_dicts.append(trace_dict)
-    
-    # Save to file
-    with open(output_file, 'w') as f:
-        if pretty:
-            json.dump(trace_dicts, f, indent=2)
-        else:
-            json.dump(trace_dicts, f)
+    Args:
+        traces: List of Trace objects to save (any iterable of traces if group is False)
+        output_file: Path to the output file; a .ndjson or .jsonl path is written one trace per line
+        pretty: Whether to format the JSON with indentation (pretty print; ignored for NDJSON)
+        group: Whether to group traces by hierarchy first; pass False to write them in the
+            given order as they come, e.g. straight from generate_dataset_iter (whose traces
+            are already in hierarchical order) without holding them all in memory
+    """
+    # Group traces by hierarchy to ensure related traces are together
+    if group:
+        traces = _group_by_hierarchy(traces)
     
-    print(f"Saved {len(traces)} traces to {output_file} (grouped by trace hierarchy)")
+    if _is_ndjson_path(output_file):
+        save_to_ndjson(traces, output_file)
+        return
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    
+    count = _write_json(traces, output_file, pretty)
+    
+    logger.info("Saved %d traces to %s%s", count, output_file, " (grouped by trace hierarchy)" if group else "")
+
+
+def _write_json(traces: Iterable[Trace], output_file: str, pretty: bool) -> int:
+    """Write traces as a JSON array, in the given order, and return how many were written."""
+    # Serialize the traces with pydantic, without building intermediate dictionaries
+    # (datetimes are written in ISO format), a batch at a time; each batch is dumped as
+    # an array whose brackets are then swapped for the separators of the whole array
+    indent = 2 if pretty else None
+    opening, separator, closing = (b"[\n", b",\n", b"\n]") if pretty else (b"[", b",", b"]")
+    
+    count = 0
+    traces = iter(traces)
+    with _open_file(output_file, 'wb') as f:
+        for batch in iter(lambda: list(islice(traces, _JSON_BATCH_SIZE)), []):
+            chunk = _TRACES_ADAPTER.dump_json(batch, indent=indent)
+            f.write(separator if count else opening)
+            f.write(chunk[len(opening):-len(closing)])
+            count += len(batch)
+        f.write(closing if count else b"[]")
+    return count
 
 
 def save_to_csv(traces: List[Trace], output_file: str) -> None:
@@ -115,81 +372,363 @@ def save_to_csv(traces: List[Trace], output_file: str) -> None:
     os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
     
     # Group traces by hierarchy (same as in save_to_json)
-    grouped_traces = []
-    
-    # Find root traces (those without parents)
-    root_traces = [trace for trace in traces if trace.parent_trace_id is None]
-    
-    # Build a child map to easily find children of a trace
-    child_map = {}
-    for trace in traces:
-        if trace.parent_trace_id:
-            if trace.parent_trace_id not in child_map:
-                child_map[trace.parent_trace_id] = []
-            child_map[trace.parent_trace_id].append(trace)
-    
-    # Recursive function to collect traces in hierarchical order
-    def collect_traces(trace):
-        collected = [trace]
-        if trace.trace_id in child_map:
-            for child in child_map[trace.trace_id]:
-                collected.extend(collect_traces(child))
-        return collected
-    
-    # Collect all traces in proper hierarchical order
-    for root_trace in root_traces:
-        grouped_traces.extend(collect_traces(root_trace))
+    _write_csv(_group_by_hierarchy(traces), output_file)
     
+    logger.info("Saved %d traces to %s (grouped by trace hierarchy)", len(traces), output_file)
+
+
+def _write_csv(grouped_traces: List[Trace], output_file: str) -> None:
+    """Write traces, already grouped by hierarchy, as CSV rows."""
     # Define CSV headers
     fieldnames = [
         "trace_id", "service_name", "service_type", "start_time", "end_time", 
         "duration_seconds", "status", "parent_trace_id", "hierarchy_level"
     ]
     
-    # Add potential metadata fields (we'll take all distinct metadata keys from traces)
-    metadata_keys = set()
+    # Add potential metadata fields (we'll take all distinct metadata keys from traces),
+    # sorted for consistent column ordering
+    metadata_keys = sorted(set(chain.from_iterable(trace.metadata for trace in grouped_traces)))
+    fieldnames.extend([f"metadata_{key}" for key in metadata_keys])
+    
+    hierarchy_levels = _hierarchy_levels(grouped_traces)
+    
+    if pa is not None:
+        _write_csv_arrow(grouped_traces, output_file, fieldnames, metadata_keys, hierarchy_levels)
+        return
+    
+    # Write to CSV, as positional rows in fieldnames order
+    with _open_file(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        
+        for trace, level in zip(grouped_traces, hierarchy_levels):
+            # Base trace data, then metadata fields
+            metadata = trace.metadata
+            writer.writerow([
+                trace.trace_id,
+                trace.service_name,
+                trace.service_type,
+                trace.start_time.isoformat(),
+                trace.end_time.isoformat(),
+                trace.duration_seconds,
+                trace.status,
+                trace.parent_trace_id or "",
+                level,
+                *[metadata.get(key, "") for key in metadata_keys]
+            ])
+
+
+def _write_csv_arrow(
+    grouped_traces: List[Trace],
+    output_file: str,
+    fieldnames: List[str],
+    metadata_keys: List[str],
+    hierarchy_levels: List[int]
+) -> None:
+    """Write the same CSV columns as _write_csv with pyarrow, which formats and writes them in C."""
+    if _has_aware_times(grouped_traces):
+        # An Arrow timestamp column would convert aware times to naive UTC, so format
+        # them with isoformat, keeping their UTC offsets as the csv module writer does
+        start_column = [trace.start_time.isoformat() for trace in grouped_traces]
+        end_column = [trace.end_time.isoformat() for trace in grouped_traces]
+        durations = pa.array([trace.duration_seconds for trace in grouped_traces], type=pa.float64())
+    else:
+        # Timestamps are formatted and durations computed by Arrow rather than per trace in Python;
+        # Arrow always writes the microseconds, which isoformat omits when they are zero
+        start_times = pa.array([trace.start_time for trace in grouped_traces], type=pa.timestamp("us"))
+        end_times = pa.array([trace.end_time for trace in grouped_traces], type=pa.timestamp("us"))
+        start_column = _format_timestamps(start_times)
+        end_column = _format_timestamps(end_times)
+        durations = pa_compute.divide(
+            pa_compute.cast(pa_compute.subtract(end_times, start_times), pa.int64()),
+            1e6
+        )
+    
+    columns = [
+        [trace.trace_id for trace in grouped_traces],
+        [trace.service_name for trace in grouped_traces],
+        [trace.service_type for trace in grouped_traces],
+        start_column,
+        end_column,
+        durations,
+        [trace.status for trace in grouped_traces],
+        [trace.parent_trace_id or "" for trace in grouped_traces],
+        pa.array(hierarchy_levels, type=pa.int64()),
+    ]
+    columns.extend([trace.metadata.get(key, "") for trace in grouped_traces] for key in metadata_keys)
+    
+    # String columns are typed explicitly so that an empty dataset still gets a header
+    table = pa.Table.from_arrays(
+        [column if isinstance(column, pa.Array) else pa.array(column, type=pa.string()) for column in columns],
+        names=fieldnames
+    )
+    with _open_file(output_file, 'wb') as f:
+        pa_csv.write_csv(table, f)
+
+
+def _has_aware_times(traces: List[Trace]) -> bool:
+    """Return whether any trace has a timezone-aware start or end time."""
+    return any(trace.start_time.tzinfo is not None or trace.end_time.tzinfo is not None for trace in traces)
+
+
+def _format_timestamps(timestamps: "pa.Array") -> "pa.Array":
+    """Format an Arrow timestamp array as ISO 8601 strings ("YYYY-MM-DDTHH:MM:SS.ffffff")."""
+    # Casting to string uses a space between the date and the time
+    return pa_compute.replace_substring(
+        pa_compute.cast(timestamps, pa.string()), " ", "T", max_replacements=1
+    )
+
+
+def _hierarchy_levels(grouped_traces: List[Trace]) -> List[int]:
+    """Return the hierarchy level of each trace, where root traces are at level 0."""
+    # Level of each trace seen so far (parents come before their children)
+    levels_by_id = {}
+    hierarchy_levels = []
     for trace in grouped_traces:
-        metadata_keys.update(trace.metadata.keys())
+        parent_trace_id = trace.parent_trace_id
+        if parent_trace_id is None:
+            level = 0
+        else:
+            level = levels_by_id.get(parent_trace_id, 0) + 1
+        levels_by_id[trace.trace_id] = level
+        hierarchy_levels.append(level)
+    return hierarchy_levels
+
+
+def save_dataset(traces: List[Trace], json_file: str, csv_file: str, pretty: bool = True) -> None:
+    """
+    Save traces to both a JSON (or NDJSON) file and a CSV file, grouping them only once.
     
-    # Sort metadata keys for consistent column ordering
-    metadata_keys = sorted(metadata_keys)
-    fieldnames.extend([f"metadata_{key}" for key in metadata_keys])
+    Args:
+        traces: List of Trace objects to save
+        json_file: Path to the JSON output file; a .ndjson or .jsonl path is written one trace per line
+        csv_file: Path to the CSV output file
+        pretty: Whether to format the JSON with indentation (ignored for NDJSON)
+    """
+    # Group traces by hierarchy once for both files
+    grouped_traces = _group_by_hierarchy(traces)
+    
+    if _is_ndjson_path(json_file):
+        save_to_ndjson(grouped_traces, json_file)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(json_file)), exist_ok=True)
+        _write_json(grouped_traces, json_file, pretty)
+        logger.info("Saved %d traces to %s (grouped by trace hierarchy)", len(traces), json_file)
+    
+    os.makedirs(os.path.dirname(os.path.abspath(csv_file)), exist_ok=True)
+    _write_csv(grouped_traces, csv_file)
+    logger.info("Saved %d traces to %s (grouped by trace hierarchy)", len(traces), csv_file)
+
+
+def save_to_chrome_trace(traces: List[Trace], output_file: str) -> None:
+    """
+    Save traces in the Chrome Trace Event format for chrome://tracing or Perfetto.
+    
+    Each trace becomes a complete ("X") event on a per-service track, with the
+    trace IDs and status attached as event args and the trace metadata nested
+    under a "metadata" arg, so a metadata key cannot shadow the trace fields.
+    
+    Args:
+        traces: List of Trace objects to save
+        output_file: Path to the output file
+    """
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
     
-    # Write to CSV
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        # Determine hierarchy level for each trace
-        hierarchy_levels = {}
-        for trace in grouped_traces:
-            if trace.parent_trace_id is None:
-                hierarchy_levels[trace.trace_id] = 0
-            else:
-                parent_level = hierarchy_levels.get(trace.parent_trace_id, 0)
-                hierarchy_levels[trace.trace_id] = parent_level + 1
-        
-        for trace in grouped_traces:
-            # Create row with base trace data
-            row = {
+    # One track (thread) per service, named via metadata events
+    service_tids = {}
+    events = []
+    for trace in traces:
+        tid = service_tids.get(trace.service_name)
+        if tid is None:
+            tid = service_tids[trace.service_name] = len(service_tids) + 1
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                           "args": {"name": trace.service_name}})
+        
+        events.append({
+            "name": trace.service_name,
+            "cat": trace.service_type,
+            "ph": "X",
+            "ts": _epoch_microseconds(trace.start_time),
+            "dur": (trace.end_time - trace.start_time) // _MICROSECOND,
+            "pid": 1,
+            "tid": tid,
+            "args": {
                 "trace_id": trace.trace_id,
-                "service_name": trace.service_name,
-                "service_type": trace.service_type,
-                "start_time": trace.start_time.isoformat(),
-                "end_time": trace.end_time.isoformat(),
-                "duration_seconds": (trace.end_time - trace.start_time).total_seconds(),
+                "parent_trace_id": trace.parent_trace_id,
                 "status": trace.status,
-                "parent_trace_id": trace.parent_trace_id or "",
-                "hierarchy_level": hierarchy_levels.get(trace.trace_id, 0)
-            }
-            
-            # Add metadata fields
-            for key in metadata_keys:
-                row[f"metadata_{key}"] = trace.metadata.get(key, "")
-            
-            writer.writerow(row)
+                "metadata": trace.metadata,
+            },
+        })
+    
+    payload = {"traceEvents": events, "displayTimeUnit": "ms"}
+    
+    with open(output_file, 'wb') as f:
+        f.write(_dumps_json(payload))
+    
+    logger.info("Saved %d traces to %s (Chrome trace event format)", len(traces), output_file)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _epoch_microseconds(value: datetime) -> int:
+    """Whole microseconds since the Unix epoch (naive times are taken as local time, as in timestamp())."""
+    # Integer arithmetic on timedeltas; a float timestamp() times 1e6 can round away from the exact value
+    return (value.astimezone(timezone.utc) - _EPOCH) // _MICROSECOND
+
+
+def save_to_parquet(traces: List[Trace], output_file: str) -> None:
+    """
+    Save traces to a Parquet file (zstd-compressed, columnar), for analytical tools.
+    
+    There is one column per trace field and one per distinct metadata key (named
+    metadata_<key>, null where a trace lacks the key); traces are grouped by hierarchy
+    as in save_to_json. Timezone-aware times keep their UTC offset, which must be the
+    same for all of them. Requires pyarrow.
+    
+    Args:
+        traces: List of Trace objects to save
+        output_file: Path to the output file
+        
+    Raises:
+        ValueError: If naive and aware times are mixed, or aware times have different UTC offsets
+    """
+    if pa is None:
+        raise ImportError("Saving to Parquet requires the pyarrow package (pip install pyarrow)")
+    
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    
+    grouped_traces = _group_by_hierarchy(traces)
+    metadata_keys = sorted(set(chain.from_iterable(trace.metadata for trace in grouped_traces)))
+    timestamp_type = _parquet_timestamp_type(grouped_traces)
+    
+    columns = {
+        "trace_id": pa.array([trace.trace_id for trace in grouped_traces], type=pa.string()),
+        "service_name": pa.array([trace.service_name for trace in grouped_traces], type=pa.string()),
+        "service_type": pa.array([trace.service_type for trace in grouped_traces], type=pa.string()),
+        "start_time": pa.array([trace.start_time for trace in grouped_traces], type=timestamp_type),
+        "end_time": pa.array([trace.end_time for trace in grouped_traces], type=timestamp_type),
+        "status": pa.array([trace.status for trace in grouped_traces], type=pa.string()),
+        "parent_trace_id": pa.array([trace.parent_trace_id for trace in grouped_traces], type=pa.string()),
+    }
+    metadata_columns = [f"metadata_{key}" for key in metadata_keys]
+    for key, column in zip(metadata_keys, metadata_columns):
+        columns[column] = pa.array([trace.metadata.get(key) for trace in grouped_traces], type=pa.string())
+    
+    # Dictionary-encode the low-cardinality string columns (IDs are unique, so they are not)
+    pa_parquet.write_table(
+        pa.table(columns),
+        output_file,
+        compression="zstd",
+        use_dictionary=["service_name", "service_type", "status", *metadata_columns]
+    )
+    
+    logger.info("Saved %d traces to %s (Parquet, grouped by trace hierarchy)", len(traces), output_file)
+
+
+def _parquet_timestamp_type(traces: List[Trace]) -> "pa.DataType":
+    """
+    Return the Arrow type of the start and end time columns, keeping the UTC offset of aware times.
+    
+    Args:
+        traces: List of Trace objects to save
+        
+    Returns:
+        timestamp[us] for naive times, or timestamp[us] with their UTC offset as the
+        timezone if all times are aware and share one offset
+        
+    Raises:
+        ValueError: If naive and aware times are mixed, or aware times have different UTC
+            offsets (an Arrow column has a single timezone)
+    """
+    # None stands for naive times
+    offsets = {time.utcoffset() for trace in traces for time in (trace.start_time, trace.end_time)}
+    if offsets <= {None}:
+        return pa.timestamp("us")
+    if len(offsets) > 1:
+        raise ValueError("Saving to Parquet requires all trace times to be naive, or aware with the same UTC offset")
+    
+    offset_seconds = int(offsets.pop().total_seconds())
+    if offset_seconds % 60:
+        raise ValueError("Saving to Parquet requires UTC offsets in whole minutes")
+    sign = "-" if offset_seconds < 0 else "+"
+    offset_minutes = abs(offset_seconds) // 60
+    return pa.timestamp("us", tz=f"{sign}{offset_minutes // 60:02d}:{offset_minutes % 60:02d}")
+
+
+def load_from_parquet(input_file: str) -> List[Trace]:
+    """
+    Load traces from a Parquet file written by save_to_parquet. Requires pyarrow.
+    
+    Args:
+        input_file: Path to the Parquet file containing traces
+        
+    Returns:
+        List of Trace objects
+    """
+    if pa is None:
+        raise ImportError("Loading from Parquet requires the pyarrow package (pip install pyarrow)")
+    
+    table = pa_parquet.read_table(input_file)
+    columns = table.to_pydict()
+    
+    # metadata_<key> columns are folded back into each trace's metadata, skipping nulls
+    metadata_columns = [column for column in table.column_names if column.startswith("metadata_")]
+    metadata_keys = [column[len("metadata_"):] for column in metadata_columns]
+    
+    rows = zip(
+        columns["trace_id"], columns["service_name"], columns["service_type"], columns["start_time"],
+        columns["end_time"], columns["status"], columns["parent_trace_id"],
+        *(columns[column] for column in metadata_columns)
+    )
+    traces = _TRACES_ADAPTER.validate_python([
+        {
+            "trace_id": trace_id,
+            "service_name": service_name,
+            "service_type": service_type,
+            "start_time": start_time,
+            "end_time": end_time,
+            "status": status,
+            "parent_trace_id": parent_trace_id,
+            "metadata": {key: value for key, value in zip(metadata_keys, metadata_values) if value is not None},
+        }
+        for trace_id, service_name, service_type, start_time, end_time, status, parent_trace_id, *metadata_values in rows
+    ])
+    
+    logger.info("Loaded %d traces from %s", len(traces), input_file)
+    return traces
+
+
+def _load_trace_file(input_file: str) -> List[Trace]:
+    """Load traces with load_from_parquet or load_from_json, depending on the file extension."""
+    if input_file.endswith(".parquet"):
+        return load_from_parquet(input_file)
+    return load_from_json(input_file)
+
+
+def save_topology(services: List[ServiceConfig], output_file: str) -> None:
+    """
+    Save a service topology to a JSON file.
     
-    print(f"Saved {len(traces)} traces to {output_file} (grouped by trace hierarchy)")
+    Args:
+        services: List of ServiceConfig objects defining the topology
+        output_file: Path to the output file
+    """
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    
+    # Serialize straight to JSON bytes in pydantic-core, without intermediate dicts
+    data = _TOPOLOGY_ADAPTER.dump_json(services, indent=2)
+    
+    # Write the bytes in one call to a temporary file and move it into place, so that
+    # an existing topology file is never left half-written
+    temp_file = output_file + ".tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(data)
+    os.replace(temp_file, output_file)
 
 
 def load_from_json(input_file: str) -> List[Trace]:
@@ -197,25 +736,112 @@ def load_from_json(input_file: str) -> List[Trace]:
     Load traces from a JSON file.
     
     Args:
-        input_file: Path to the JSON file containing traces
+        input_file: Path to the JSON file containing traces; a .ndjson or .jsonl path is read one trace per line
         
     Returns:
         List of Trace objects
     """
-    with open(input_file, 'r') as f:
-        trace_dicts = json.load(f)
-    
-    traces = []
-    for trace_dict in trace_dicts:
-        # Convert ISO datetime strings back to datetime objects
-        trace_dict["start_time"] = datetime.fromisoformat(trace_dict["start_time"])
-        trace_dict["end_time"] = datetime.fromisoformat(trace_dict["end_time"])
-        traces.append(Trace(**trace_dict))
+    if _is_ndjson_path(input_file):
+        traces = list(iter_from_ndjson(input_file))
+    else:
+        # Parse and validate the whole array with pydantic in one pass
+        with _open_file(input_file, 'rb') as f:
+            traces = _TRACES_ADAPTER.validate_json(f.read())
     
-    print(f"Loaded {len(traces)} traces from {input_file}")
+    logger.info("Loaded %d traces from %s", len(traces), input_file)
     return traces
 
 
+def save_to_ndjson(traces: Iterable[Trace], output_file: str) -> None:
+    """
+    Save traces to a newline-delimited JSON file, one trace per line.
+    
+    Traces are written in the order they are given, one at a time, so a lazy
+    iterable (e.g. from generate_dataset_iter) is never held in memory as a whole.
+    
+    Args:
+        traces: Iterable of Trace objects to save
+        output_file: Path to the output file
+    """
+    # Create output directory if it doesn't exist
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    
+    count = 0
+    with _open_file(output_file, 'wb') as f:
+        for trace in traces:
+            f.write(trace.model_dump_json().encode("utf-8") + b"\n")
+            count += 1
+    
+    logger.info("Saved %d traces to %s (one trace per line)", count, output_file)
+
+
+def iter_from_ndjson(input_file: str) -> Iterator[Trace]:
+    """
+    Lazily load traces from a newline-delimited JSON file.
+    
+    Args:
+        input_file: Path to the NDJSON file containing traces
+        
+    Yields:
+        Trace objects, in file order
+    """
+    with _open_file(input_file, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield Trace.model_validate_json(line)
+
+
+def load_trace_hierarchy_from_ndjson(input_file: str, root_trace_id: str) -> List[Trace]:
+    """
+    Load a single trace hierarchy from a newline-delimited JSON file, without parsing the other traces.
+    
+    Only lines that mention the root trace ID, or the ID of a trace already found in the
+    hierarchy, are parsed. The file is scanned again as long as the previous scan found
+    new traces, since their children may come earlier in the file; when parents come
+    before their children (as in files written by save_to_json, save_to_ndjson and the
+    generate command), the second scan finds nothing new and parses no further lines.
+    
+    Args:
+        input_file: Path to the NDJSON file containing traces
+        root_trace_id: ID of the root trace of the hierarchy
+        
+    Returns:
+        List of Trace objects in the hierarchy, in file order (empty if the root is not found)
+    """
+    # Traces found so far, by line number
+    hierarchy = {}
+    hierarchy_ids = set()
+    
+    # Quoted IDs, as pydantic writes them (UTF-8, not escaped to ASCII), of the traces
+    # whose children (or, at first, the root itself) may appear in the file; a line that
+    # contains none of them is skipped without being parsed
+    markers = [json.dumps(root_trace_id, ensure_ascii=False).encode()]
+    
+    found_new = True
+    while found_new:
+        found_new = False
+        with _open_file(input_file, 'rb') as f:
+            for line_number, line in enumerate(f):
+                if line_number in hierarchy or not any(marker in line for marker in markers):
+                    continue
+                
+                # The marker may also have matched inside another field, so check the IDs
+                trace = Trace.model_validate_json(line)
+                if hierarchy_ids:
+                    if trace.parent_trace_id not in hierarchy_ids:
+                        continue
+                elif trace.trace_id != root_trace_id:
+                    continue
+                
+                hierarchy[line_number] = trace
+                hierarchy_ids.add(trace.trace_id)
+                markers.append(json.dumps(trace.trace_id, ensure_ascii=False).encode())
+                found_new = True
+    
+    logger.info("Loaded %d traces from %s", len(hierarchy), input_file)
+    return [hierarchy[line_number] for line_number in sorted(hierarchy)]
+
+
 def generate_random_topology(
     num_services: int = 10,
     max_depth: int = 3,
@@ -275,59 +901,76 @@ def generate_random_topology(
     
     for proxy in proxy_names:
         # Proxy services can connect to web services, respecting max_width
-        available_targets = web_names.copy()
-        random.shuffle(available_targets)
-        width = min(max_width, len(available_targets))
-        connections[proxy] = available_targets[:width]
+        width = min(max_width, len(web_names))
+        connections[proxy] = random.sample(web_names, width)
     
-    for web in web_names:
+    for web_idx, web in enumerate(web_names):
         # Web services can connect to other web services or databases
         available_targets = []
         
         # Add some web services (but avoid circular dependencies by using indices)
-        web_idx = web_names.index(web)
-        later_webs = web_names[web_idx+1:] if web_idx < len(web_names) - 1 else []
+        later_webs = web_names[web_idx+1:]
         if later_webs and random.random() < 0.7:  # 70% chance to connect to another web service
             available_targets.extend(later_webs)
         
         # Add databases
         available_targets.extend(db_names)
         
-        random.shuffle(available_targets)
         width = min(max_width, len(available_targets))
-        connections[web] = available_targets[:width]
+        connections[web] = random.sample(available_targets, width)
     
     for db in db_names:
         # Database services don't connect to anything
         connections[db] = []
     
-    # Apply depth limitation (ensure we don't exceed max_depth by pruning connections)
+    # Apply depth limitation (ensure we don't exceed max_depth by pruning connections).
+    # Longest path lengths are computed once and then updated as connections are removed;
+    # web services only connect to later web services and databases, and nothing connects
+    # to a proxy, so this order lists every service after all the services it connects to
+    path_lengths = _longest_path_lengths(connections, db_names + web_names[::-1] + proxy_names)
+    
+    # Services connecting to each service, i.e. whose path lengths a removal can change
+    callers = {service: [] for service in all_services}
+    for service, targets in connections.items():
+        for target in targets:
+            callers[target].append(service)
+    
     for _ in range(max_depth, 10):  # Cap at 10 iterations to avoid infinite loops
         for service in all_services:
             # Skip if no connections or already at acceptable depth
-            if not connections[service]:
-                continue
+            if connections[service] and path_lengths[service] > max_depth:
+                # Remove the first connection to reduce depth
+                callers[connections[service].pop(0)].remove(service)
                 
-            # Check for paths that exceed max_depth
-            for target in connections[service][:]:  # Create a copy to modify during iteration
-                path_length = find_longest_path(connections, service)
-                if path_length > max_depth:
-                    # Remove some connections to reduce depth
-                    connections[service].remove(target)
-                    break
+                # Update the path lengths of this service and, while they change, its callers
+                stack = [service]
+                while stack:
+                    changed = stack.pop()
+                    path_length = 1 + max((path_lengths[target] for target in connections[changed]), default=0)
+                    if path_length != path_lengths[changed]:
+                        path_lengths[changed] = path_length
+                        stack.extend(callers[changed])
     
     # Apply variability by randomly adding/removing connections
     if variability > 0:
+        # Sets for constant-time service type checks
+        proxy_set = set(proxy_names)
+        web_set = set(web_names)
+        db_set = set(db_names)
+        
         for service in all_services:
-            if random.random() < variability and service not in db_names:
-                # Maybe add a connection
+            if random.random() < variability and service not in db_set and len(connections[service]) < max_width:
+                # Maybe add a connection (candidates keep their list order, so the
+                # choice is reproducible for a given seed)
                 available_targets = []
-                if service in proxy_names:
-                    available_targets = [s for s in web_names if s not in connections[service]]
-                elif service in web_names:
-                    available_targets = [s for s in web_names + db_names if s not in connections[service] and s != service]
+                excluded = set(connections[service])
+                excluded.add(service)
+                if service in proxy_set:
+                    available_targets = [s for s in web_names if s not in excluded]
+                elif service in web_set:
+                    available_targets = [s for s in chain(web_names, db_names) if s not in excluded]
                 
-                if available_targets and len(connections[service]) < max_width:
+                if available_targets:
                     connections[service].append(random.choice(available_targets))
                 
             if random.random() < variability and connections[service]:
@@ -349,82 +992,113 @@ def generate_random_topology(
     
     for service in db_names:
         service_configs.append(
-            ServiceConfig(name=service, service_type="database", connections=[])
+            ServiceConfig(name=service, service_type="database")
         )
     
     return service_configs
 
 
-def find_longest_path(connections, start_service, visited=None):
-    """Helper function to find the longest path from a service in the topology."""
-    if visited is None:
-        visited = set()
-    
-    if start_service in visited:
-        return 0  # Avoid cycles
+def _longest_path_lengths(connections: Dict[str, List[str]], services: List[str]) -> Dict[str, int]:
+    """
+    Compute the longest path length (in services) from every service of an acyclic topology.
     
-    visited.add(start_service)
+    Args:
+        connections: Mapping of each service name to the services it connects to
+        services: All service names, each listed after every service it connects to
+        
+    Returns:
+        Dictionary mapping each service name to its longest path length, as find_longest_path
+    """
+    path_lengths = {}
+    for service in services:
+        path_lengths[service] = 1 + max((path_lengths[target] for target in connections[service]), default=0)
+    return path_lengths
+
+
+def find_longest_path(connections, start_service, visited=None):
+    """
+    Find the length (in services) of the longest call path from a service in the topology.
     
-    if not connections[start_service]:
-        return 1  # Leaf node
+    Each service is expanded once and its path length memoized, which is exact for acyclic
+    topologies (as generated); a connection back into the current path counts as a dead end.
     
-    max_length = 0
-    for next_service in connections[start_service]:
-        path_length = find_longest_path(connections, next_service, visited.copy())
-        max_length = max(max_length, path_length)
+    Args:
+        connections: Mapping of each service name to the services it connects to
+        start_service: The service to start from
+        visited: Optional services to treat as already on the path
+        
+    Returns:
+        Number of services on the longest path, or 0 if start_service is in visited
+    """
+    on_path = set(visited) if visited else set()
+    if start_service in on_path:
+        return 0  # Avoid cycles
     
-    return max_length + 1
+    # Depth-first walk with an explicit stack of (service, remaining connections)
+    path_lengths = {}
+    longest_child = {start_service: 0}
+    on_path.add(start_service)
+    stack = [(start_service, iter(connections[start_service]))]
+    while stack:
+        service, targets = stack[-1]
+        for target in targets:
+            if target in on_path:
+                continue  # Avoid cycles
+            if target in path_lengths:
+                longest_child[service] = max(longest_child[service], path_lengths[target])
+                continue
+            # Expand the target before the rest of this service's connections
+            longest_child[target] = 0
+            on_path.add(target)
+            stack.append((target, iter(connections[target])))
+            break
+        else:
+            # All connections done: the path length of this service is now known
+            stack.pop()
+            on_path.discard(service)
+            path_lengths[service] = longest_child.pop(service) + 1
+            if stack:
+                parent = stack[-1][0]
+                longest_child[parent] = max(longest_child[parent], path_lengths[service])
+    
+    return path_lengths[start_service]
 
 
-def extract_trace_hierarchy(traces: List[Trace], root_trace_id: str) -> List[Trace]:
+def extract_trace_hierarchy(
+    traces: List[Trace],
+    root_trace_id: str,
+    child_map: Optional[Dict[str, List[Trace]]] = None
+) -> List[Trace]:
     """
     Extract a complete trace hierarchy starting from the given root trace ID.
     
     Args:
         traces: List of all Trace objects
         root_trace_id: The ID of the root trace to extract the hierarchy for
+        child_map: Child index of traces from build_child_map, to reuse across calls;
+            built here if omitted
         
     Returns:
         List of Trace objects representing the complete hierarchy
     """
-    trace_map = {trace.trace_id: trace for trace in traces}
+    root_trace = next((trace for trace in traces if trace.trace_id == root_trace_id), None)
     
-    if root_trace_id not in trace_map:
-        print(f"Warning: Trace ID {root_trace_id} not found in traces")
+    if root_trace is None:
+        logger.warning("Warning: Trace ID %s not found in traces", root_trace_id)
         return []
     
-    # Find all traces in this hierarchy
-    result = []
-    
-    # Build a child map to easily find children of a trace
-    child_map = {}
-    for trace in traces:
-        if trace.parent_trace_id:
-            if trace.parent_trace_id not in child_map:
-                child_map[trace.parent_trace_id] = []
-            child_map[trace.parent_trace_id].append(trace)
-    
-    # Recursive function to collect traces in hierarchical order
-    def collect_traces(trace_id):
-        if trace_id not in trace_map:
-            return []
-        
-        trace = trace_map[trace_id]
-        collected = [trace]
-        
-        if trace_id in child_map:
-            for child in child_map[trace_id]:
-                collected.extend(collect_traces(child.trace_id))
-        
-        return collected
-    
-    # Start collecting from the root trace
-    result = collect_traces(root_trace_id)
-    
-    return result
+    # Collect all traces in this hierarchy, in hierarchical order
+    if child_map is None:
+        child_map = build_child_map(traces)
+    return [trace for trace, _ in iter_hierarchy(root_trace, child_map)]
 
 
-def print_trace_summary(traces: List[Trace], trace_id: Optional[str] = None, max_traces: int = 10):
+def print_trace_summary(
+    traces: List[Trace],
+    trace_id: Optional[str] = None,
+    max_traces: int = 10,
+    child_map: Optional[Dict[str, List[Trace]]] = None
+):
     """
     Print a summary of traces, optionally filtering to a specific trace_id and its hierarchy.
     
@@ -432,79 +1106,52 @@ def print_trace_summary(traces: List[Trace], trace_id: Optional[str] = None, max
         traces: List of Trace objects
         trace_id: Optional trace ID to filter by (showing only this trace and its children)
         max_traces: Maximum number of root traces to display
+        child_map: Child index of traces from build_child_map, to reuse across calls when
+            showing a trace hierarchy; built here if omitted
     """
     if not traces:
         print("No traces to display.")
         return
     
-    # Group traces by their root trace
-    trace_map = {trace.trace_id: trace for trace in traces}
-    traces_by_parent = {}
-    root_traces = []
-    
-    for trace in traces:
-        if trace.parent_trace_id is None:
-            root_traces.append(trace)
-        else:
-            if trace.parent_trace_id not in traces_by_parent:
-                traces_by_parent[trace.parent_trace_id] = []
-            traces_by_parent[trace.parent_trace_id].append(trace)
-    
     # If a specific trace_id is provided, filter to just that trace and its hierarchy
     if trace_id:
-        filtered_traces = extract_trace_hierarchy(traces, trace_id)
+        filtered_traces = extract_trace_hierarchy(traces, trace_id, child_map)
         if filtered_traces:
             print(f"\n=== Trace Hierarchy for ID: {trace_id} ===")
-            
-            # Create a temporary TraceGenerator to use its pretty_print_traces method
-            from trace_generator import TraceGenerator
-            
-            # We need to find all services mentioned in the traces
-            service_names = set()
-            service_types = {}
-            service_connections = {}
-            
-            for t in filtered_traces:
-                service_names.add(t.service_name)
-                service_types[t.service_name] = t.service_type
-            
-            # Create minimal ServiceConfig objects
-            from trace_generator import ServiceConfig
-            services = [
-                ServiceConfig(
-                    name=name,
-                    service_type=service_types.get(name, "web"),
-                    connections=[]
-                )
-                for name in service_names
-            ]
-            
-            generator = TraceGenerator(services)
-            generator.pretty_print_traces(filtered_traces)
+            pretty_print_traces(filtered_traces)
         else:
             print(f"No traces found with ID {trace_id}")
         return
     
+    # Gather all statistics in a single pass over the traces
+    root_traces = []
+    service_names = set()
+    service_type_counts = {}
+    children_counts = {}
+    success_count = 0
+    for trace in traces:
+        service_names.add(trace.service_name)
+        service_type_counts[trace.service_type] = service_type_counts.get(trace.service_type, 0) + 1
+        if trace.status == "success":
+            success_count += 1
+        parent_trace_id = trace.parent_trace_id
+        if parent_trace_id is None:
+            root_traces.append(trace)
+        else:
+            children_counts[parent_trace_id] = children_counts.get(parent_trace_id, 0) + 1
+    error_count = len(traces) - success_count
+    
     # Print summary
     print(f"\n=== Trace Summary ===")
     print(f"Total traces: {len(traces)}")
-    print(f"Unique services: {len(set(t.service_name for t in traces))}")
+    print(f"Unique services: {len(service_names)}")
     print(f"Root traces: {len(root_traces)}")
     
-    # Count by service type
-    service_type_counts = {}
-    for trace in traces:
-        if trace.service_type not in service_type_counts:
-            service_type_counts[trace.service_type] = 0
-        service_type_counts[trace.service_type] += 1
-    
     print("\nCounts by service type:")
     for service_type, count in service_type_counts.items():
         print(f"  {service_type}: {count} traces")
     
-    # Count success vs error
-    success_count = sum(1 for trace in traces if trace.status == "success")
-    error_count = len(traces) - success_count
+    # Success vs error
     
     print(f"\nSuccess rate: {success_count/len(traces)*100:.1f}% ({success_count}/{len(traces)})")
     print(f"Error rate: {error_count/len(traces)*100:.1f}% ({error_count}/{len(traces)})")
@@ -513,8 +1160,8 @@ def print_trace_summary(traces: List[Trace], trace_id: Optional[str] = None, max
     if root_traces:
         print(f"\nSample of root traces (first {min(max_traces, len(root_traces))}):")
         for i, trace in enumerate(root_traces[:max_traces]):
-            children_count = len(traces_by_parent.get(trace.trace_id, []))
-            duration = (trace.end_time - trace.start_time).total_seconds()
+            children_count = children_counts.get(trace.trace_id, 0)
+            duration = trace.duration_seconds
             print(f"  {i+1}. {trace.trace_id} - {trace.service_name} ({trace.service_type}) - "
                   f"Status: {trace.status}, Children: {children_count}, Duration: {duration:.3f}s")
     
@@ -612,8 +1259,13 @@ def main():
     parser = argparse.ArgumentParser(description="Generate and save trace datasets")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
+    # Options shared by every command
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Only print results and errors, not progress messages")
+    
     # Generate command
-    gen_parser = subparsers.add_parser("generate", help="Generate trace datasets")
+    gen_parser = subparsers.add_parser("generate", parents=[common_parser], help="Generate trace datasets")
     
     # Dataset generation parameters
     topology_group = gen_parser.add_mutually_exclusive_group()
@@ -631,6 +1283,9 @@ def main():
                         help="Number of performance groups")
     gen_parser.add_argument("--seed", type=int, default=None,
                         help="Random seed for reproducible generation")
+    gen_parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes to generate traces with; with more than one, "
+                             "the traces are split into that many independently seeded shards")
     
     # Random topology parameters
     random_topo_group = gen_parser.add_argument_group("Random Topology Options")
@@ -647,9 +1302,13 @@ def main():
     
     # Output parameters
     gen_parser.add_argument("--json", type=str, default="",
-                        help="Output JSON file path")
+                        help="Output JSON file path (.ndjson/.jsonl for one trace per line); "
+                             "defaults to a timestamped .ndjson.zst file (.ndjson without zstandard) "
+                             "if none of --json, --csv and --parquet is given")
     gen_parser.add_argument("--csv", type=str, default="",
                         help="Output CSV file path")
+    gen_parser.add_argument("--parquet", type=str, default="",
+                        help="Output Parquet file path (requires pyarrow)")
     gen_parser.add_argument("--no-pretty", action="store_true",
                         help="Don't pretty-print JSON output")
     gen_parser.add_argument("--preview", action="store_true",
@@ -660,8 +1319,8 @@ def main():
                         help="Save the service topology to a JSON file")
     
     # Analyze command
-    analyze_parser = subparsers.add_parser("analyze", help="Analyze existing trace datasets")
-    analyze_parser.add_argument("input_file", type=str, help="JSON file containing traces to analyze")
+    analyze_parser = subparsers.add_parser("analyze", parents=[common_parser], help="Analyze existing trace datasets")
+    analyze_parser.add_argument("input_file", type=str, help="JSON, NDJSON or Parquet file containing traces to analyze")
     analyze_parser.add_argument("--trace", type=str, default=None,
                                help="Specific trace ID to analyze (shows the full hierarchy)")
     analyze_parser.add_argument("--max-traces", type=int, default=10,
@@ -672,11 +1331,15 @@ def main():
                                help="Output file for regrouped traces (required with --regroup)")
     
     # Convert command
-    convert_parser = subparsers.add_parser("convert", help="Convert between trace file formats")
-    convert_parser.add_argument("input_file", type=str, help="Input trace file (JSON)")
-    convert_parser.add_argument("output_file", type=str, help="Output file path (.json or .csv)")
+    convert_parser = subparsers.add_parser("convert", parents=[common_parser], help="Convert between trace file formats")
+    convert_parser.add_argument("input_file", type=str, help="Input trace file (JSON, NDJSON or Parquet)")
+    convert_parser.add_argument("output_file", type=str, help="Output file path (.json, .ndjson, .jsonl, .csv or .parquet)")
     convert_parser.add_argument("--no-pretty", action="store_true",
                                help="Don't pretty-print JSON output")
+    convert_parser.add_argument("--no-regroup", action="store_true",
+                               help="Keep the traces in file order in JSON output; a JSON file converted "
+                                    "to JSON with the same formatting is then copied without being parsed "
+                                    "or validated")
     
     args = parser.parse_args()
     
@@ -684,11 +1347,22 @@ def main():
     if not args.command:
         args.command = "generate"
     
+    # Progress messages go to stdout, as plain lines, unless --quiet is given
+    logging.basicConfig(
+        level=logging.WARNING if getattr(args, "quiet", False) else logging.INFO,
+        format="%(message)s",
+        stream=sys.stdout
+    )
+    
     # Process generate command
     if args.command == "generate":
+        # Time the run started, for the default output file name
+        start_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
         # Generate services based on topology or random parameters
         if args.random_topology:
-            print(f"Generating random topology with {args.num_services} services, max depth {args.max_depth}, max width {args.max_width}...")
+            logger.info("Generating random topology with %d services, max depth %d, max width %d...",
+                        args.num_services, args.max_depth, args.max_width)
             services = generate_random_topology(
                 num_services=args.num_services,
                 max_depth=args.max_depth,
@@ -703,50 +1377,90 @@ def main():
             topology_type = args.topology if args.topology else "microservices"
             services = generate_example_services(topology_type)
             topology_name = topology_type
-            print(f"Using predefined {topology_type} topology with {len(services)} services")
+            logger.info("Using predefined %s topology with %d services", topology_type, len(services))
         
         # Save topology if requested
         if args.save_topology:
             topology_file = args.save_topology
-            service_dicts = [s.model_dump() for s in services]
-            with open(topology_file, 'w') as f:
-                json.dump(service_dicts, f, indent=2)
-            print(f"Saved service topology to {topology_file}")
-        
-        # Generate dataset
-        print(f"Generating {args.num_traces} traces...")
-        traces = generate_dataset(
-            services=services,
-            num_traces=args.num_traces,
-            randomization_level=args.randomization,
-            num_groups=args.num_groups,
-            seed=args.seed
-        )
+            save_topology(services, topology_file)
+            logger.info("Saved service topology to %s", topology_file)
+        
+        # The preview, CSV and Parquet outputs need all traces in memory; otherwise they
+        # are generated lazily and written to the JSON file as they come
+        needs_all_traces = args.preview or args.csv or args.parquet
+        
+        # Generate dataset shard by shard across worker processes, as a list, or lazily;
+        # generated traces are already in hierarchical order
+        if args.workers > 1:
+            logger.info("Generating %d traces with %d workers...", args.num_traces, args.workers)
+            traces = generate_dataset_parallel(
+                services=services,
+                num_traces=args.num_traces,
+                randomization_level=args.randomization,
+                num_groups=args.num_groups,
+                seed=args.seed,
+                num_shards=args.workers,
+                max_workers=args.workers
+            )
+        elif needs_all_traces:
+            logger.info("Generating %d traces...", args.num_traces)
+            # The command owns the process, so it can pause the garbage collector
+            traces = generate_dataset(
+                services=services,
+                num_traces=args.num_traces,
+                randomization_level=args.randomization,
+                num_groups=args.num_groups,
+                seed=args.seed,
+                pause_gc=True
+            )
+        else:
+            logger.info("Generating %d traces...", args.num_traces)
+            traces = generate_dataset_iter(
+                services=services,
+                num_traces=args.num_traces,
+                randomization_level=args.randomization,
+                num_groups=args.num_groups,
+                seed=args.seed
+            )
         
         # Preview traces if requested
         if args.preview:
-            generator = TraceGenerator(services)
             print("\n=== Trace Preview ===")
-            generator.pretty_print_traces(traces, max_traces=args.preview_max)
+            pretty_print_traces(traces, max_traces=args.preview_max)
         
-        # Save to JSON if path provided
-        if args.json:
-            save_to_json(traces, args.json, pretty=not args.no_pretty)
-        
-        # Save to CSV if path provided
-        if args.csv:
+        # Save to JSON and/or CSV if paths provided (grouping the traces once for both)
+        if args.json and args.csv:
+            save_dataset(traces, args.json, args.csv, pretty=not args.no_pretty)
+        elif args.json:
+            save_to_json(traces, args.json, pretty=not args.no_pretty, group=False)
+        elif args.csv:
             save_to_csv(traces, args.csv)
+        if args.parquet:
+            save_to_parquet(traces, args.parquet)
         
-        # If no output specified, save to default files
-        if not args.json and not args.csv:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            default_json = f"traces_{topology_name}_{args.num_traces}_{timestamp}.json"
-            save_to_json(traces, default_json, pretty=not args.no_pretty)
+        # If no output specified, save to a default NDJSON file (one trace per line,
+        # which loads back line by line rather than as one array), zstd-compressed if
+        # zstandard is installed so that large datasets are not bound by disk writes
+        if not args.json and not args.csv and not args.parquet:
+            default_json = f"traces_{topology_name}_{args.num_traces}_{start_timestamp}.ndjson"
+            if zstandard is not None:
+                default_json += ".zst"
+            save_to_json(traces, default_json, group=False)
     
     # Process analyze command
     elif args.command == "analyze":
-        print(f"Loading traces from {args.input_file}...")
-        traces = load_from_json(args.input_file)
+        logger.info("Loading traces from %s...", args.input_file)
+        
+        # A single hierarchy can be read from an NDJSON file without parsing the other
+        # traces, unless all of them are needed to regroup the file
+        if args.trace and not args.regroup and _is_ndjson_path(args.input_file):
+            traces = load_trace_hierarchy_from_ndjson(args.input_file, args.trace)
+            if not traces:
+                logger.warning("Warning: Trace ID %s not found in traces", args.trace)
+                print(f"No traces found with ID {args.trace}")
+                return
+        else:
+            traces = _load_trace_file(args.input_file)
         
         # Print summary or specific trace hierarchy
         print_trace_summary(traces, trace_id=args.trace, max_traces=args.max_traces)
@@ -757,20 +1471,33 @@ def main():
                 print("Error: --output is required with --regroup")
                 return
             
-            print(f"Regrouping traces and saving to {args.output}...")
+            logger.info("Regrouping traces and saving to %s...", args.output)
             save_to_json(traces, args.output, pretty=True)
     
     # Process convert command
     elif args.command == "convert":
-        print(f"Converting {args.input_file} to {args.output_file}...")
-        traces = load_from_json(args.input_file)
+        logger.info("Converting %s to %s...", args.input_file, args.output_file)
+        
+        # Without regrouping, a file that is already in the output format only needs
+        # to be copied (and decompressed or compressed)
+        if args.no_regroup and _can_copy_trace_file(args.input_file, args.output_file, pretty=not args.no_pretty):
+            _copy_trace_file(args.input_file, args.output_file)
+            logger.info("Copied %s to %s (already in the output format)", args.input_file, args.output_file)
+            return
+        
+        traces = _load_trace_file(args.input_file)
+        
+        # Output format from the file extension, ignoring any compression extension
+        output_path = _strip_compression_extension(args.output_file)
         
-        if args.output_file.endswith(".json"):
-            save_to_json(traces, args.output_file, pretty=not args.no_pretty)
-        elif args.output_file.endswith(".csv"):
+        if output_path.endswith((".json",) + _NDJSON_EXTENSIONS):
+            save_to_json(traces, args.output_file, pretty=not args.no_pretty, group=not args.no_regroup)
+        elif output_path.endswith(".csv"):
             save_to_csv(traces, args.output_file)
+        elif args.output_file.endswith(".parquet"):
+            save_to_parquet(traces, args.output_file)
         else:
-            print(f"Error: Unsupported output format. Use .json or .csv extension.")
+            print(f"Error: Unsupported output format. Use .json, .ndjson, .jsonl or .csv extension (optionally with .gz or .zst), or .parquet.")
 
 
 if __name__ == "__main__":